@@ -3,6 +3,50 @@ import numpy as np
 import json
 from datetime import datetime
 
+# Quarter lags compared by calculate_growth_table
+GROWTH_LAGS = {'qoq': 1, 'yoy': 4}
+
+def parse_period_key(periods):
+    """Quarter index (year * 4 + quarter - 1) for 'YYYY-Qn' labels, NaN where a label doesn't parse.
+
+    Only the distinct labels are parsed, so this stays cheap on millions of rows.
+    """
+    codes, labels = pd.factorize(periods)
+    parts = pd.Series(labels, dtype=object).astype(str).str.extract(r'^\s*(\d{4})\s*-?\s*Q([1-4])\s*$')
+    keys = pd.to_numeric(parts[0]).to_numpy(dtype='float64') * 4 + pd.to_numeric(parts[1]).to_numpy(dtype='float64') - 1
+    return pd.Series(np.where(codes >= 0, keys[codes], np.nan), index=periods.index)
+
+def _company_period_order(company_codes, period_keys):
+    """Sort order of rows by (company, period) and one sorted integer key per row.
+    
+    The padding between companies keeps a lag from reaching into the previous
+    company's quarters.
+    """
+    order = np.lexsort((period_keys, company_codes))
+    first = period_keys.min() if len(period_keys) else 0
+    span = (period_keys.max() - first if len(period_keys) else 0) + 1 + max(GROWTH_LAGS.values())
+    return order, company_codes[order] * span + (period_keys[order] - first)
+
+def _lagged_rows(combined, lag):
+    """Position of the row lag quarters earlier for each sorted key, -1 where there is none"""
+    earlier = np.minimum(np.searchsorted(combined, combined - lag), max(len(combined) - 1, 0))
+    return np.where(combined[earlier] == combined - lag, earlier, -1)
+
+def _growth_rate(values, previous_rows):
+    """Change of every row against its previous row, NaN where there is no previous row"""
+    previous = np.where((previous_rows >= 0)[:, None], values[previous_rows], np.nan)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (values - previous) / previous
+
+def _growth_columns(values, combined, metrics):
+    """<metric>_growth_<label> arrays for every metric and every lag in GROWTH_LAGS"""
+    growth = {}
+    for label, lag in GROWTH_LAGS.items():
+        change = _growth_rate(values, _lagged_rows(combined, lag))
+        for position, metric in enumerate(metrics):
+            growth[f"{metric}_growth_{label}"] = change[:, position]
+    return growth
+
 class FinancialDataProcessor:
     """Process and validate financial data for analysis"""
     
@@ -19,8 +63,12 @@ class FinancialDataProcessor:
             self.cleaning_log.append(f"❌ Error loading data: {str(e)}")
             return None
     
-    def validate_data_quality(self, df):
-        """Validate data quality and completeness"""
+    def validate_data_quality(self, df, by=None):
+        """Validate data quality and completeness.
+        
+        Outliers are values outside 1.5 IQR of their column, or of their column within
+        each `by` group (e.g. 'industry') when given.
+        """
         validation_results = {
             'total_rows': len(df),
             'missing_values': {},
@@ -33,24 +81,63 @@ class FinancialDataProcessor:
         validation_results['missing_values'] = missing_data[missing_data > 0].to_dict()
         
         # Validate data types
-        for column in df.columns:
-            validation_results['data_types'][column] = str(df[column].dtype)
+        validation_results['data_types'] = df.dtypes.astype(str).to_dict()
         
         # Check for outliers in numerical columns
-        numerical_columns = df.select_dtypes(include=[np.number]).columns
-        for column in numerical_columns:
-            Q1 = df[column].quantile(0.25)
-            Q3 = df[column].quantile(0.75)
-            IQR = Q3 - Q1
-            outliers = df[(df[column] < (Q1 - 1.5 * IQR)) | (df[column] > (Q3 + 1.5 * IQR))]
-            validation_results['outliers'][column] = len(outliers)
+        outliers = self._count_outliers(df, by)
+        validation_results['outliers'] = outliers.sum().to_dict()
+        if by is not None:
+            validation_results['outliers_by_group'] = outliers.to_dict('index')
         
         return validation_results
     
-    def clean_financial_data(self, df):
-        """Clean and preprocess financial data"""
-        # Create a copy to avoid modifying original
-        cleaned_df = df.copy()
+    @staticmethod
+    def _outlier_bounds(numerical, keys=None, labels=None):
+        """1.5 IQR bounds as (lower, upper) arrays of shape group x column.
+        
+        All quartiles come from one quantile call. When grouped by keys, rows follow labels
+        plus a trailing all-NaN row for rows without a group (factorize code -1).
+        """
+        if keys is None:
+            quartiles = numerical.quantile([0.25, 0.75]).to_numpy()[:, None, :]
+        else:
+            grouped = numerical.groupby(keys).quantile([0.25, 0.75])
+            quartiles = np.stack([grouped.xs(q, level=-1).reindex(list(labels) + [np.nan]).to_numpy()
+                                  for q in (0.25, 0.75)])
+        iqr = quartiles[1] - quartiles[0]
+        return quartiles[0] - 1.5 * iqr, quartiles[1] + 1.5 * iqr
+    
+    def _count_outliers(self, df, by=None):
+        """Outlier counts per numerical column, one row per `by` group (a single 'all' row without)"""
+        numerical = df.select_dtypes(include=[np.number])
+        if by is None:
+            codes, groups = None, ['all']
+            lower, upper = self._outlier_bounds(numerical)
+        else:
+            numerical = numerical.drop(columns=by, errors='ignore')
+            codes, groups = pd.factorize(df[by])
+            lower, upper = self._outlier_bounds(numerical, df[by], groups)
+        
+        # One boolean reduction per column, so no filtered copies or frame-sized masks are built
+        counts = np.zeros((len(groups), numerical.shape[1]), dtype='int64')
+        for position, column in enumerate(numerical.columns):
+            values = numerical[column].to_numpy(dtype='float64', na_value=np.nan)
+            if codes is None:
+                counts[0, position] = ((values < lower[0, position]) | (values > upper[0, position])).sum()
+            else:
+                # Rows without a group compare against NaN bounds and never count
+                outside = (values < lower[codes, position]) | (values > upper[codes, position])
+                counts[:, position] = np.bincount(codes[outside], minlength=len(groups))
+        return pd.DataFrame(counts, index=groups, columns=numerical.columns)
+    
+    def clean_financial_data(self, df, inplace=False):
+        """Clean and preprocess financial data.
+        
+        By default the input is left untouched without copying it: the result shares every
+        column with `df` and only the columns that get cleaned are replaced (copy-on-write).
+        With inplace=True those columns are replaced in `df` itself.
+        """
+        cleaned_df = df if inplace else df.copy(deep=False)
         
         # Handle missing values
         numerical_columns = ['revenue', 'cogs', 'gross_profit', 'operating_income', 'net_income',
@@ -59,19 +146,18 @@ class FinancialDataProcessor:
                            'shareholders_equity']
         
         for column in numerical_columns:
-            if column in cleaned_df.columns and cleaned_df[column].isnull().any():
+            if column in cleaned_df.columns and cleaned_df[column].hasnans:
                 median_value = cleaned_df[column].median()
-                cleaned_df[column].fillna(median_value, inplace=True)
+                cleaned_df[column] = cleaned_df[column].fillna(median_value)
                 self.cleaning_log.append(f"✅ Filled missing values in {column} with median: {median_value}")
         
         # Ensure positive values for certain columns
-        positive_columns = ['revenue', 'total_assets', 'shareholders_equity']
-        for column in positive_columns:
-            if column in cleaned_df.columns:
-                negative_count = (cleaned_df[column] < 0).sum()
-                if negative_count > 0:
-                    cleaned_df[column] = cleaned_df[column].abs()
-                    self.cleaning_log.append(f"✅ Converted {negative_count} negative values to positive in {column}")
+        positive_columns = [column for column in ['revenue', 'total_assets', 'shareholders_equity']
+                            if column in cleaned_df.columns]
+        negative_counts = (cleaned_df[positive_columns] < 0).sum()
+        for column, negative_count in negative_counts[negative_counts > 0].items():
+            cleaned_df[column] = cleaned_df[column].abs()
+            self.cleaning_log.append(f"✅ Converted {negative_count} negative values to positive in {column}")
         
         # Validate financial relationships
         self._validate_financial_relationships(cleaned_df)
@@ -90,31 +176,59 @@ class FinancialDataProcessor:
         if not balance_sheet_check.all():
             self.cleaning_log.append("⚠️  Balance sheet equation doesn't balance for some records")
     
+    def calculate_growth_table(self, df, metrics=None):
+        """QoQ and YoY growth of every metric for every company and period.
+        
+        Rows are sorted once on (company, parsed period). Each row is then matched to the
+        same company's row one quarter (QoQ) and four quarters (YoY) earlier by a sorted
+        lookup, so a missing quarter gives NaN growth instead of comparing the wrong rows.
+        Rows whose period doesn't parse are left out.
+        """
+        if metrics is None:
+            metrics = [column for column in df.select_dtypes(include=[np.number]).columns if column != 'company_id']
+        
+        keys = parse_period_key(df['period'])
+        valid = keys.notna().to_numpy()
+        if not valid.all():
+            self.cleaning_log.append(f"⚠️  Skipped {(~valid).sum()} rows with unrecognized periods in growth metrics")
+        
+        company_codes = pd.factorize(df['company_id'], sort=True)[0][valid]
+        order, combined = _company_period_order(company_codes, keys.to_numpy()[valid].astype('int64'))
+        
+        rows = np.flatnonzero(valid)[order]
+        id_columns = [column for column in ['company_id', 'company_name', 'industry', 'period'] if column in df.columns]
+        growth = _growth_columns(df[metrics].to_numpy(dtype='float64')[rows], combined, metrics)
+        return pd.concat([df[id_columns].take(rows).reset_index(drop=True), pd.DataFrame(growth)], axis=1)
+    
     def calculate_growth_metrics(self, df):
         """Calculate growth rates and trends"""
-        growth_data = {}
-        
-        for company_id in df['company_id'].unique():
-            company_data = df[df['company_id'] == company_id].sort_values('period')
-            company_name = company_data['company_name'].iloc[0]
-            
-            if len(company_data) > 1:
-                # Calculate quarter-over-quarter growth
-                latest = company_data.iloc[-1]
-                previous = company_data.iloc[-2]
-                
-                revenue_growth = (latest['revenue'] - previous['revenue']) / previous['revenue']
-                net_income_growth = (latest['net_income'] - previous['net_income']) / previous['net_income']
-                
-                growth_data[company_id] = {
-                    'company_name': company_name,
-                    'revenue_growth_qoq': revenue_growth,
-                    'net_income_growth_qoq': net_income_growth,
-                    'latest_period': latest['period'],
-                    'previous_period': previous['period']
-                }
-        
-        return growth_data
+        growth = self.calculate_growth_table(df, ['revenue', 'net_income'])
+        
+        # Latest quarter per company (the table is sorted by company and period)
+        company = growth['company_id'].to_numpy()
+        is_latest = np.append(company[1:] != company[:-1], True)
+        has_previous = np.insert(company[1:] == company[:-1], 0, False)
+        latest = np.flatnonzero(is_latest & has_previous)
+        
+        # The quarter QoQ growth was measured against, None where that quarter is missing
+        _, combined = _company_period_order(pd.factorize(company)[0],
+                                            parse_period_key(growth['period']).to_numpy().astype('int64'))
+        previous = _lagged_rows(combined, GROWTH_LAGS['qoq'])[latest]
+        periods = growth['period'].to_numpy()
+        previous_periods = np.where(previous >= 0, periods[previous], None)
+        return {
+            company_id: {
+                'company_name': company_name,
+                'revenue_growth_qoq': revenue_growth,
+                'net_income_growth_qoq': net_income_growth,
+                'latest_period': latest_period,
+                'previous_period': previous_period
+            }
+            for company_id, company_name, revenue_growth, net_income_growth, latest_period, previous_period in zip(
+                company[latest], growth['company_name'].to_numpy()[latest],
+                growth['revenue_growth_qoq'].to_numpy()[latest], growth['net_income_growth_qoq'].to_numpy()[latest],
+                periods[latest], previous_periods)
+        }
     
     def generate_data_quality_report(self, validation_results):
         """Generate data quality assessment report"""
@@ -6,10 +6,41 @@ import seaborn as sns
 from datetime import datetime
 import os
 
+# Ratios calculated per category, in the order of the calculate_*_ratios methods
+RATIO_CATEGORIES = {
+    'profitability': ['gross_margin', 'operating_margin', 'net_margin', 'roa', 'roe'],
+    'liquidity': ['current_ratio', 'quick_ratio', 'cash_ratio'],
+    'leverage': ['debt_to_equity', 'debt_ratio', 'interest_coverage'],
+    'efficiency': ['asset_turnover', 'inventory_turnover', 'receivables_turnover'],
+    'valuation': ['pe_ratio', 'pb_ratio', 'ps_ratio']
+}
+
+RATIO_COLUMNS = [name for names in RATIO_CATEGORIES.values() for name in names]
+RATIO_CATEGORY = [category for category, names in RATIO_CATEGORIES.items() for _ in names]
+
+# Statement columns carried over into the ratio table
+ID_COLUMNS = ['company_id', 'company_name', 'industry', 'period']
+
+# Ratios scored by the financial health assessment, with their pass/fail wording
+HEALTH_METRICS = [
+    ('net_margin', 'Strong', 'Weak'),
+    ('roe', 'Strong', 'Weak'),
+    ('roa', 'Strong', 'Weak'),
+    ('current_ratio', 'Good', 'Poor'),
+    ('quick_ratio', 'Good', 'Poor')
+]
+
+def _records(frame):
+    """Rows of a frame as plain dicts, built from column lists (faster than to_dict('records'))"""
+    names = list(frame.columns)
+    columns = [frame[name].to_numpy(dtype=object).tolist() for name in names]
+    return [dict(zip(names, values)) for values in zip(*columns)]
+
 class FinancialAnalyzer:
     def __init__(self, data_path, benchmarks_path):
         self.data = pd.read_csv(data_path)
         self.benchmarks = self.load_benchmarks(benchmarks_path)
+        self.benchmark_table = self.compile_benchmarks(self.benchmarks)
         self.analysis_results = {}
         
     def load_benchmarks(self, benchmarks_path):
@@ -17,6 +48,14 @@ class FinancialAnalyzer:
         with open(benchmarks_path, 'r') as f:
             return json.load(f)
     
+    @staticmethod
+    def compile_benchmarks(benchmarks):
+        """Flatten the nested benchmarks into an industry x ratio table (NaN where none is set)"""
+        rows = {industry: {name: categories.get(category, {}).get(name, np.nan)
+                           for category, name in zip(RATIO_CATEGORY, RATIO_COLUMNS)}
+                for industry, categories in benchmarks['industry_benchmarks'].items()}
+        return pd.DataFrame.from_dict(rows, orient='index', columns=RATIO_COLUMNS, dtype='float64')
+    
     def calculate_profitability_ratios(self, company_data):
         """Calculate profitability ratios"""
         ratios = {}
@@ -67,7 +106,7 @@ class FinancialAnalyzer:
         # Interest Coverage (simplified)
         ebit = company_data['operating_income']
         interest_expense = company_data['long_term_debt'] * 0.05  # Assume 5% interest
-        ratios['interest_coverage'] = ebit / interest_expense if interest_expense > 0 else float('inf')
+        ratios['interest_coverage'] = (ebit / interest_expense).where(interest_expense > 0, np.inf)
         
         return ratios
     
@@ -92,7 +131,7 @@ class FinancialAnalyzer:
         
         # P/E Ratio
         eps = company_data['net_income'] / company_data['shares_outstanding']
-        ratios['pe_ratio'] = company_data['stock_price'] / eps if eps > 0 else float('inf')
+        ratios['pe_ratio'] = (company_data['stock_price'] / eps).where(eps > 0, np.inf)
         
         # P/B Ratio
         book_value_per_share = company_data['shareholders_equity'] / company_data['shares_outstanding']
@@ -104,37 +143,126 @@ class FinancialAnalyzer:
         
         return ratios
     
+    def calculate_ratio_table(self, data=None):
+        """Calculate every ratio for every company and period at once (one row per statement).
+        
+        The calculate_*_ratios methods work on whole columns, so they are applied to the
+        full frame of statements rather than row by row.
+        """
+        data = self.data if data is None else data
+        ratios = {}
+        for calculate in (self.calculate_profitability_ratios, self.calculate_liquidity_ratios,
+                          self.calculate_leverage_ratios, self.calculate_efficiency_ratios,
+                          self.calculate_valuation_ratios):
+            ratios.update(calculate(data))
+        ratios = pd.DataFrame(ratios, index=data.index, columns=RATIO_COLUMNS)
+        
+        return pd.concat([data[ID_COLUMNS], ratios], axis=1)
+    
+    @staticmethod
+    def ratios_by_category(record):
+        """Nested {category: {ratio: value}} view of one ratio table row"""
+        return {category: {name: record[name] for name in names}
+                for category, names in RATIO_CATEGORIES.items()}
+    
     def analyze_company(self, company_id):
         """Comprehensive analysis for a single company"""
-        company_data = self.data[self.data['company_id'] == company_id].iloc[-1]  # Latest quarter
-        company_name = company_data['company_name']
-        industry = company_data['industry']
+        company_data = self.data[self.data['company_id'] == company_id].iloc[-1:]  # Latest quarter
+        table = self.calculate_ratio_table(company_data)
         
-        print(f"\n=== Financial Analysis: {company_name} ({industry}) ===")
+        print(f"\n=== Financial Analysis: {table['company_name'].iloc[0]} ({table['industry'].iloc[0]}) ===")
         
-        # Calculate all ratios
-        ratios = {}
-        ratios['profitability'] = self.calculate_profitability_ratios(company_data)
-        ratios['liquidity'] = self.calculate_liquidity_ratios(company_data)
-        ratios['leverage'] = self.calculate_leverage_ratios(company_data)
-        ratios['efficiency'] = self.calculate_efficiency_ratios(company_data)
-        ratios['valuation'] = self.calculate_valuation_ratios(company_data)
-        
-        # Compare with benchmarks
-        industry_benchmarks = self.benchmarks['industry_benchmarks'][industry]
-        comparison = self.compare_with_benchmarks(ratios, industry_benchmarks)
-        
-        # Store results
-        self.analysis_results[company_id] = {
-            'company_name': company_name,
-            'industry': industry,
-            'period': company_data['period'],
-            'ratios': ratios,
-            'benchmark_comparison': comparison,
-            'financial_health': self.assess_financial_health(ratios, industry_benchmarks)
-        }
-        
-        return ratios
+        self._store_analyses(table)
+        return self.analysis_results[company_id]['ratios']
+    
+    def analyze_all_companies(self):
+        """Analyze every company's latest quarter from one ratio table pass"""
+        table = self.calculate_ratio_table()
+        # Same statement analyze_company picks: each company's last row
+        latest = table.drop_duplicates('company_id', keep='last')
+        self._store_analyses(latest)
+        
+        print(f"✅ Analyzed {len(latest)} companies ({len(table)} statements)")
+        return table
+    
+    def _store_analyses(self, table):
+        """Store the nested per-company results for ratio table rows (one per company)"""
+        comparison = self.compare_all_with_benchmarks(table)
+        health = self.assess_all_financial_health(table)
+        
+        comparison_rows = {}
+        for row in _records(comparison):
+            comparison_rows.setdefault(row['company_id'], []).append(row)
+        
+        for record, company_health in zip(_records(table), _records(health)):
+            self.analysis_results[record['company_id']] = {
+                'company_name': record['company_name'],
+                'industry': record['industry'],
+                'period': record['period'],
+                'ratios': self.ratios_by_category(record),
+                'benchmark_comparison': self.comparison_by_category(comparison_rows.get(record['company_id'], [])),
+                'financial_health': company_health
+            }
+    
+    def compare_all_with_benchmarks(self, table):
+        """Compare every ratio of every row with its industry benchmark in one broadcast.
+        
+        Returns one row per statement and benchmarked ratio; ratios without a (non-zero)
+        benchmark are left out, as in compare_with_benchmarks.
+        """
+        benchmarks = self.benchmark_table.reindex(table['industry']).to_numpy()
+        values = table[RATIO_COLUMNS].to_numpy(dtype='float64')
+        with np.errstate(divide='ignore', invalid='ignore'):
+            difference = values - benchmarks
+            percentage_diff = difference / benchmarks * 100
+        
+        rows, columns = np.nonzero(~np.isnan(benchmarks) & (benchmarks != 0))
+        categories = list(RATIO_CATEGORIES)
+        category_codes = np.array([categories.index(category) for category in RATIO_CATEGORY])
+        return pd.DataFrame({
+            'company_id': table['company_id'].to_numpy()[rows],
+            'period': table['period'].to_numpy()[rows],
+            'category': pd.Categorical.from_codes(category_codes[columns], categories),
+            'ratio': pd.Categorical.from_codes(columns, RATIO_COLUMNS),
+            'company_value': values[rows, columns],
+            'benchmark_value': benchmarks[rows, columns],
+            'difference': difference[rows, columns],
+            'percentage_diff': percentage_diff[rows, columns],
+            'status': pd.Categorical.from_codes((difference[rows, columns] > 0).astype('int8'), ['Below', 'Above'])
+        })
+    
+    @staticmethod
+    def comparison_by_category(rows):
+        """Nested {category: {ratio: {...}}} view of one statement's comparison rows"""
+        comparison = {category: {} for category in RATIO_CATEGORIES}
+        for row in rows:
+            comparison[row['category']][row['ratio']] = {
+                'company_value': row['company_value'],
+                'benchmark_value': row['benchmark_value'],
+                'difference': row['difference'],
+                'percentage_diff': row['percentage_diff'],
+                'status': row['status']
+            }
+        return comparison
+    
+    def assess_all_financial_health(self, table):
+        """Health score, rating and insights for every row of a ratio table at once"""
+        metrics = [metric for metric, _, _ in HEALTH_METRICS]
+        benchmarks = self.benchmark_table.reindex(table['industry'])[metrics].to_numpy()
+        passed = table[metrics].to_numpy(dtype='float64') >= benchmarks
+        
+        score = passed.mean(axis=1) * 100
+        rating = np.select([score >= 80, score >= 60, score >= 40], ['Excellent', 'Good', 'Fair'], 'Poor')
+        labels = [metric.replace('_', ' ').title() for metric in metrics]
+        insights = np.where(passed,
+                            [f"✅ {good} {label}" for (_, good, _), label in zip(HEALTH_METRICS, labels)],
+                            [f"⚠️  {bad} {label}" for (_, _, bad), label in zip(HEALTH_METRICS, labels)])
+        
+        return pd.DataFrame({
+            'score': score,
+            'rating': rating,
+            'insights': insights.tolist()
+        }, index=table.index)
     
     def compare_with_benchmarks(self, ratios, benchmarks):
         """Compare company ratios with industry benchmarks"""
@@ -208,13 +336,10 @@ class FinancialAnalyzer:
     
     def generate_dashboard_data(self):
         """Generate data for dashboard visualization"""
-        dashboard_data = {}
-        
-        for company_id in self.data['company_id'].unique():
-            company_analysis = self.analyze_company(company_id)
-            dashboard_data[company_id] = self.analysis_results[company_id]
+        self.analyze_all_companies()
         
-        return dashboard_data
+        return {company_id: self.analysis_results[company_id]
+                for company_id in self.data['company_id'].unique()}
     
     def save_analysis_results(self):
         """Save analysis results to files"""
@@ -1,8 +1,26 @@
 import pandas as pd
 import numpy as np
 
+def masked_divide(numerator, denominator, valid=None, fill=np.inf):
+    """Elementwise division for scalars, arrays, Series or DataFrames with NumPy semantics.
+
+    x / 0 gives inf and 0 / 0 gives NaN instead of raising. Where `valid` is False
+    (or NaN) the result is replaced by `fill`, e.g. inf for a P/E on non-positive earnings.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        result = np.divide(numerator, denominator)
+    if valid is None:
+        return result
+    if isinstance(result, (pd.Series, pd.DataFrame)):
+        return result.where(valid, fill)
+    return np.where(valid, result, fill)[()]  # [()] turns 0-d results back into scalars
+
 class RatioCalculator:
-    """Advanced financial ratio calculations with validation"""
+    """Advanced financial ratio calculations with validation.
+
+    `data` can be a dict of scalars or arrays, a Series (one statement) or a DataFrame
+    (many statements); every ratio is computed elementwise in one call.
+    """
     
     @staticmethod
     def calculate_all_ratios(financial_data):
@@ -31,20 +49,17 @@ class RatioCalculator:
         """Calculate profitability ratios"""
         ratios = {}
         
-        try:
-            # Basic profitability ratios
-            ratios['gross_margin'] = data['gross_profit'] / data['revenue']
-            ratios['operating_margin'] = data['operating_income'] / data['revenue']
-            ratios['net_margin'] = data['net_income'] / data['revenue']
-            ratios['roa'] = data['net_income'] / data['total_assets']
-            ratios['roe'] = data['net_income'] / data['shareholders_equity']
-            
-            # Advanced profitability ratios
-            ratios['ebitda_margin'] = (data['operating_income'] + data.get('depreciation', 0)) / data['revenue']
-            ratios['operating_cash_flow_margin'] = data.get('operating_cash_flow', data['net_income']) / data['revenue']
-            
-        except ZeroDivisionError:
-            print("Warning: Division by zero in profitability ratios")
+        # Basic profitability ratios
+        ratios['gross_margin'] = masked_divide(data['gross_profit'], data['revenue'])
+        ratios['operating_margin'] = masked_divide(data['operating_income'], data['revenue'])
+        ratios['net_margin'] = masked_divide(data['net_income'], data['revenue'])
+        ratios['roa'] = masked_divide(data['net_income'], data['total_assets'])
+        ratios['roe'] = masked_divide(data['net_income'], data['shareholders_equity'])
+        
+        # Advanced profitability ratios
+        ratios['ebitda_margin'] = masked_divide(data['operating_income'] + data.get('depreciation', 0), data['revenue'])
+        ratios['operating_cash_flow_margin'] = masked_divide(data.get('operating_cash_flow', data['net_income']),
+                                                             data['revenue'])
         
         return ratios
     
@@ -53,18 +68,14 @@ class RatioCalculator:
         """Calculate liquidity and solvency ratios"""
         ratios = {}
         
-        try:
-            # Current liquidity ratios
-            ratios['current_ratio'] = data['current_assets'] / data['current_liabilities']
-            ratios['quick_ratio'] = (data['current_assets'] - data['inventory']) / data['current_liabilities']
-            ratios['cash_ratio'] = data['cash'] / data['current_liabilities']
-            
-            # Working capital metrics
-            ratios['working_capital'] = data['current_assets'] - data['current_liabilities']
-            ratios['working_capital_ratio'] = data['current_assets'] / data['current_liabilities']
-            
-        except ZeroDivisionError:
-            print("Warning: Division by zero in liquidity ratios")
+        # Current liquidity ratios
+        ratios['current_ratio'] = masked_divide(data['current_assets'], data['current_liabilities'])
+        ratios['quick_ratio'] = masked_divide(data['current_assets'] - data['inventory'], data['current_liabilities'])
+        ratios['cash_ratio'] = masked_divide(data['cash'], data['current_liabilities'])
+        
+        # Working capital metrics
+        ratios['working_capital'] = data['current_assets'] - data['current_liabilities']
+        ratios['working_capital_ratio'] = masked_divide(data['current_assets'], data['current_liabilities'])
         
         return ratios
     
@@ -73,22 +84,18 @@ class RatioCalculator:
         """Calculate leverage and solvency ratios"""
         ratios = {}
         
-        try:
-            # Debt ratios
-            ratios['debt_to_equity'] = data['total_liabilities'] / data['shareholders_equity']
-            ratios['debt_ratio'] = data['total_liabilities'] / data['total_assets']
-            ratios['equity_ratio'] = data['shareholders_equity'] / data['total_assets']
-            
-            # Coverage ratios
-            ebit = data['operating_income']
-            interest_expense = data.get('interest_expense', data['long_term_debt'] * 0.05)
-            ratios['interest_coverage'] = ebit / interest_expense if interest_expense > 0 else float('inf')
-            
-            # Financial leverage
-            ratios['financial_leverage'] = data['total_assets'] / data['shareholders_equity']
-            
-        except ZeroDivisionError:
-            print("Warning: Division by zero in leverage ratios")
+        # Debt ratios
+        ratios['debt_to_equity'] = masked_divide(data['total_liabilities'], data['shareholders_equity'])
+        ratios['debt_ratio'] = masked_divide(data['total_liabilities'], data['total_assets'])
+        ratios['equity_ratio'] = masked_divide(data['shareholders_equity'], data['total_assets'])
+        
+        # Coverage ratios
+        ebit = data['operating_income']
+        interest_expense = data.get('interest_expense', data['long_term_debt'] * 0.05)
+        ratios['interest_coverage'] = masked_divide(ebit, interest_expense, interest_expense > 0)
+        
+        # Financial leverage
+        ratios['financial_leverage'] = masked_divide(data['total_assets'], data['shareholders_equity'])
         
         return ratios
     
@@ -97,22 +104,18 @@ class RatioCalculator:
         """Calculate efficiency and activity ratios"""
         ratios = {}
         
-        try:
-            # Turnover ratios (annualized for quarterly data)
-            ratios['asset_turnover'] = (data['revenue'] * 4) / data['total_assets']
-            ratios['inventory_turnover'] = (data['cogs'] * 4) / data['inventory']
-            ratios['receivables_turnover'] = (data['revenue'] * 4) / data['accounts_receivable']
-            
-            # Days ratios
-            ratios['days_inventory'] = 365 / ratios['inventory_turnover'] if ratios['inventory_turnover'] > 0 else float('inf')
-            ratios['days_receivables'] = 365 / ratios['receivables_turnover'] if ratios['receivables_turnover'] > 0 else float('inf')
-            
-            # Fixed asset turnover
-            fixed_assets = data['total_assets'] - data['current_assets']
-            ratios['fixed_asset_turnover'] = data['revenue'] / fixed_assets if fixed_assets > 0 else float('inf')
-            
-        except ZeroDivisionError:
-            print("Warning: Division by zero in efficiency ratios")
+        # Turnover ratios (annualized for quarterly data)
+        ratios['asset_turnover'] = masked_divide(data['revenue'] * 4, data['total_assets'])
+        ratios['inventory_turnover'] = masked_divide(data['cogs'] * 4, data['inventory'])
+        ratios['receivables_turnover'] = masked_divide(data['revenue'] * 4, data['accounts_receivable'])
+        
+        # Days ratios
+        ratios['days_inventory'] = masked_divide(365, ratios['inventory_turnover'], ratios['inventory_turnover'] > 0)
+        ratios['days_receivables'] = masked_divide(365, ratios['receivables_turnover'], ratios['receivables_turnover'] > 0)
+        
+        # Fixed asset turnover
+        fixed_assets = data['total_assets'] - data['current_assets']
+        ratios['fixed_asset_turnover'] = masked_divide(data['revenue'], fixed_assets, fixed_assets > 0)
         
         return ratios
     
@@ -121,23 +124,20 @@ class RatioCalculator:
         """Calculate market valuation ratios"""
         ratios = {}
         
-        try:
-            # Basic valuation ratios
-            eps = data['net_income'] / data['shares_outstanding']
-            ratios['pe_ratio'] = data['stock_price'] / eps if eps > 0 else float('inf')
-            
-            book_value_per_share = data['shareholders_equity'] / data['shares_outstanding']
-            ratios['pb_ratio'] = data['stock_price'] / book_value_per_share
-            
-            sales_per_share = data['revenue'] / data['shares_outstanding']
-            ratios['ps_ratio'] = data['stock_price'] / sales_per_share
-            
-            # Advanced valuation ratios
-            ratios['ev_to_ebitda'] = RatioCalculator.calculate_ev_to_ebitda(data)
-            ratios['dividend_yield'] = data.get('dividends', 0) / data['stock_price'] if data['stock_price'] > 0 else 0
-            
-        except ZeroDivisionError:
-            print("Warning: Division by zero in valuation ratios")
+        # Basic valuation ratios
+        eps = masked_divide(data['net_income'], data['shares_outstanding'])
+        ratios['pe_ratio'] = masked_divide(data['stock_price'], eps, eps > 0)
+        
+        book_value_per_share = masked_divide(data['shareholders_equity'], data['shares_outstanding'])
+        ratios['pb_ratio'] = masked_divide(data['stock_price'], book_value_per_share)
+        
+        sales_per_share = masked_divide(data['revenue'], data['shares_outstanding'])
+        ratios['ps_ratio'] = masked_divide(data['stock_price'], sales_per_share)
+        
+        # Advanced valuation ratios
+        ratios['ev_to_ebitda'] = RatioCalculator.calculate_ev_to_ebitda(data)
+        ratios['dividend_yield'] = masked_divide(data.get('dividends', 0), data['stock_price'],
+                                                 data['stock_price'] > 0, fill=0.0)
         
         return ratios
     
@@ -151,7 +151,7 @@ class RatioCalculator:
             ebitda = data['operating_income'] + data.get('depreciation', data['operating_income'] * 0.1)
             
             enterprise_value = market_cap + debt - cash
-            return enterprise_value / ebitda if ebitda > 0 else float('inf')
+            return masked_divide(enterprise_value, ebitda, ebitda > 0)
         except:
             return float('inf')
     
@@ -209,7 +209,11 @@ if __name__ == "__main__":
     ratios = calculator.calculate_all_ratios(sample_data)
     
     print("📊 Calculated Financial Ratios:")
-    for category, ratio_dict in ratios.items():
-        print(f"\n{category.upper()}:")
-        for ratio, value in ratio_dict.items():
-            print(f"  {ratio}: {value:.4f}")
+    for ratio, value in ratios.items():
+        print(f"  {ratio}: {value:.4f}")
+    
+    # The same call works on a whole table of statements
+    statements = pd.DataFrame([sample_data] * 3)
+    statements.loc[1, 'net_income'] = -500000  # Loss-making quarter: P/E becomes inf
+    print("\n📊 Ratios for a table of statements:")
+    print(pd.DataFrame(calculator.calculate_all_ratios(statements))[['net_margin', 'pe_ratio', 'interest_coverage']])
@@ -11,11 +11,27 @@ DATA_CONFIG = {
 # Analysis Configuration
 ANALYSIS_CONFIG = {
     'time_period': 'monthly',  # daily, weekly, monthly, quarterly
+    'rolling_window': 3,  # Periods in the moving average of time_series_analysis
     'top_n_products': 5,
     'regions': ['North', 'South', 'East', 'West'],
     'currency': 'USD'
 }
 
+# Performance Configuration
+PERFORMANCE_CONFIG = {
+    'streaming': False,  # Aggregate the file chunk by chunk instead of loading it whole
+    'chunk_size': 1_000_000,  # Rows per chunk in streaming mode
+    'workers': 1,  # Worker processes for streaming mode, None uses every core
+    'approximate_top_n': False,  # Track top products in bounded memory during the streaming pass
+    'heavy_hitters_capacity': 10_000,  # Products tracked by the approximate top-N summary
+    'cache_parsed_data': True,  # Keep a typed columnar copy next to the CSV, refreshed when it changes
+    'compact_dtypes': False,  # Load category_columns as categoricals and downcast value_columns
+    'downcast_floats': False,  # Also store float value columns as float32 (rounds revenue)
+    'incremental': False,  # Fold only newly appended rows into the saved aggregate state
+    'state_path': 'results/aggregate_state',  # Saved aggregate state for incremental mode
+    'startup_budget_seconds': 1.0  # Import time allowed before the analysis starts
+}
+
 # Visualization Configuration
 VISUALIZATION_CONFIG = {
     'style': 'seaborn-v0_8',
@@ -29,7 +45,10 @@ VISUALIZATION_CONFIG = {
         'danger': '#DC3545'
     },
     'save_format': 'png',
-    'dpi': 300
+    'dpi': 300,
+    'headless': False,  # Render charts to files only; plotting libraries load on first chart
+    'group_dashboard_dpi': 100,  # Resolution of the per-region dashboards
+    'render_workers': 1  # Processes rendering per-region dashboards, None uses every core
 }
 
 # Output Configuration
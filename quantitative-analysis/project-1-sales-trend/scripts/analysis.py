@@ -1,6 +1,7 @@
+import time
+_STARTED = time.perf_counter()  # Startup budget covers everything imported below
+
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
 import json
 import os
@@ -11,18 +12,109 @@ import sys
 
 # Add config to path and import settings
 sys.path.append('config')
-from settings import DATA_CONFIG, ANALYSIS_CONFIG, VISUALIZATION_CONFIG, OUTPUT_CONFIG
+from settings import DATA_CONFIG, ANALYSIS_CONFIG, VISUALIZATION_CONFIG, OUTPUT_CONFIG, PERFORMANCE_CONFIG
+from sales_aggregates import ChunkOptions, aggregate_chunk, stream_aggregate
+from sales_cache import load_with_cache
+from sales_incremental import update_aggregate
+from sales_parallel import parallel_aggregate
+from sales_dtypes import compact_frame, memory_usage_mb
+from sales_timeseries import TimeSeriesEngine
+from sales_topn import TopProducts, exact_top
+from sales_charts import draw_dashboard, draw_region_dashboard, render_charts
+
+
+def load_pyplot():
+    """Import pyplot on first use so runs without charts never pay for it"""
+    import matplotlib  # pylint: disable=import-outside-toplevel
+    if VISUALIZATION_CONFIG['headless']:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+    plt.style.use(VISUALIZATION_CONFIG['style'])
+    return plt
+
+class LoadMode:
+    """How SalesAnalyzer loads the data, and what the loading step reported"""
+
+    def __init__(self, streaming=None, incremental=None, compact=None):
+        self.streaming = PERFORMANCE_CONFIG['streaming'] if streaming is None else streaming
+        self.incremental = PERFORMANCE_CONFIG['incremental'] if incremental is None else incremental
+        self.compact = PERFORMANCE_CONFIG['compact_dtypes'] if compact is None else compact
+        self.cache_info = None
+        self.update_info = None
+        self.memory_info = None
+        # Approximate top products are tracked during the streaming pass over the raw rows
+        self.top_products = None
+        if self.streaming and not self.incremental and PERFORMANCE_CONFIG['approximate_top_n']:
+            self.top_products = TopProducts(PERFORMANCE_CONFIG['heavy_hitters_capacity'])
+    
+    def update_summary(self):
+        """How incremental mode brought the saved state up to date"""
+        if self.update_info['mode'] == 'incremental':
+            return f"Incremental mode: {self.update_info['new_rows']} new rows folded into saved state"
+        return f"Incremental mode: full rebuild ({self.update_info['reason']})"
+    
+    def cache_summary(self):
+        """Whether the parsed-data cache was hit and how long loading took"""
+        action = 'loaded from' if self.cache_info['status'] == 'hit' else 'parsed, saved to'
+        return (f"Data cache {self.cache_info['status']}: {action} {self.cache_info['cache_file']} "
+                f"({self.cache_info['format']}) in {self.cache_info['seconds']:.3f}s")
+    
+    def memory_summary(self, data):
+        """Memory use of the compacted data, with the size before compacting when known"""
+        # Cache hits load already compacted data, so only the current size is known
+        after = self.memory_info['after_mb'] if self.memory_info else memory_usage_mb(data)
+        before = f"{self.memory_info['before_mb']:.1f} MB -> " if self.memory_info else ""
+        return f"Memory (compact dtypes): {before}{after:.1f} MB"
 
 class SalesAnalyzer:
-    def __init__(self, data_path=None):
+    def __init__(self, data_path=None, streaming=None, incremental=None, compact=None):
         # Use config path or provided path
         self.data_path = data_path or DATA_CONFIG['data_path']
-        self.data = pd.read_csv(self.data_path)
-        self.data[DATA_CONFIG['date_column']] = pd.to_datetime(self.data[DATA_CONFIG['date_column']])
+        self.mode = LoadMode(streaming, incremental, compact)
+        self.aggregate = None
+        self.row_count = 0
+        
+        if self.mode.incremental:
+            # Saved aggregate state plus only the rows appended since the last run
+            self.data = None
+            self.aggregate, self.mode.update_info = update_aggregate(
+                self.data_path, PERFORMANCE_CONFIG['state_path'],
+                PERFORMANCE_CONFIG['chunk_size'], DATA_CONFIG['date_column'], self.mode.compact)
+            self.row_count = self.mode.update_info['rows']
+        elif self.mode.streaming and PERFORMANCE_CONFIG['workers'] != 1:
+            # Each worker streams its own slice of the file, partial aggregates are merged
+            self.data = None
+            self.aggregate, self.row_count = parallel_aggregate(
+                self.data_path, PERFORMANCE_CONFIG['workers'], self._chunk_options(), self.mode.top_products)
+        elif self.mode.streaming:
+            # Only the running aggregates are kept, the raw rows are never held in memory
+            self.data = None
+            self.aggregate, self.row_count = stream_aggregate(
+                self.data_path, self._chunk_options(), self.mode.top_products)
+        elif PERFORMANCE_CONFIG['cache_parsed_data']:
+            self.data, self.mode.cache_info = load_with_cache(
+                self.data_path, self.parse_data, {'compact_dtypes': self.mode.compact,
+                                                  'downcast_floats': PERFORMANCE_CONFIG['downcast_floats']})
+            self.row_count = len(self.data)
+        else:
+            self.data = self.parse_data(self.data_path)
+            self.row_count = len(self.data)
         
-        # Apply visualization settings
-        plt.style.use(VISUALIZATION_CONFIG['style'])
+    def _chunk_options(self):
+        return ChunkOptions(PERFORMANCE_CONFIG['chunk_size'], DATA_CONFIG['date_column'], self.mode.compact)
+    
+    def parse_data(self, data_path):
+        """Read the sales CSV, convert the date column and optionally compact the dtypes"""
+        data = pd.read_csv(data_path)
+        data[DATA_CONFIG['date_column']] = pd.to_datetime(data[DATA_CONFIG['date_column']])
         
+        if self.mode.compact:
+            before = memory_usage_mb(data)
+            compact_frame(data, DATA_CONFIG['category_columns'], DATA_CONFIG['value_columns'],
+                          PERFORMANCE_CONFIG['downcast_floats'])
+            self.mode.memory_info = {'before_mb': before, 'after_mb': memory_usage_mb(data)}
+        return data
+    
     def load_config(self, config_file='config/analysis_config.json'):
         """Load configuration from JSON file"""
         try:
@@ -40,6 +132,23 @@ class SalesAnalyzer:
         
         print("=== Sales Data Overview ===")
         print(f"Project: {config.get('project', {}).get('name', 'Sales Analysis')}")
+        
+        if self.mode.update_info:
+            print(self.mode.update_summary())
+        
+        if self.data is None:
+            print(f"Aggregated {self.row_count} rows in chunks of {PERFORMANCE_CONFIG['chunk_size']}")
+            print(f"Aggregate shape: {self.aggregate.shape}")
+            print("\nFirst 5 aggregate rows:")
+            print(self.aggregate.head())
+            return self.aggregate
+        
+        if self.mode.cache_info:
+            print(self.mode.cache_summary())
+        
+        if self.mode.compact:
+            print(self.mode.memory_summary(self.data))
+        
         print(f"Dataset shape: {self.data.shape}")
         print("\nFirst 5 rows:")
         print(self.data.head())
@@ -50,38 +159,82 @@ class SalesAnalyzer:
         
         return self.data
     
+    def get_aggregate(self):
+        """Return the month x product x category x region aggregate, building it once"""
+        if self.aggregate is None:
+            self.aggregate = aggregate_chunk(self.data, DATA_CONFIG['date_column'])
+        return self.aggregate
+    
+    def _rollup(self, key):
+        """Sum the aggregate up to a single dimension"""
+        return self.get_aggregate().groupby(level=key, observed=True)[['units_sold', 'revenue', 'units_sold_count', 'revenue_count']].sum()
+    
+    def _totals_by(self, key):
+        """Total units sold and revenue per value of a category column"""
+        return self._rollup(key)[['units_sold', 'revenue']]
+    
     def monthly_trend_analysis(self):
         """Analyze monthly sales trends"""
-        monthly_data = self.data.groupby(self.data['date'].dt.to_period('M')).agg({
-            'units_sold': 'sum',
-            'revenue': 'sum'
-        }).reset_index()
-        
-        monthly_data['date'] = monthly_data['date'].dt.to_timestamp()
+        monthly_data = self._rollup('month')[['units_sold', 'revenue']].reset_index()
+        monthly_data = monthly_data.rename(columns={'month': 'date'})
         
         print("\n=== Monthly Sales Trends ===")
         print(monthly_data)
         
         return monthly_data
     
+    def time_series_analysis(self, by='product', value='revenue', time_period=None, window=None):
+        """Resampled trend, rolling mean, growth and cumulative totals per product or region"""
+        time_period = time_period or ANALYSIS_CONFIG['time_period']
+        window = window or ANALYSIS_CONFIG['rolling_window']
+        trends = TimeSeriesEngine(self, DATA_CONFIG['date_column']).trends(time_period, value, by, window)
+        
+        print(f"\n=== {time_period.title()} {value.replace('_', ' ').title()} Trends by {by or 'total'} ===")
+        print(trends.tail(10))
+        
+        return trends
+    
     def product_performance(self):
         """Analyze product performance"""
-        product_stats = self.data.groupby('product').agg({
-            'units_sold': ['sum', 'mean'],
-            'revenue': ['sum', 'mean']
+        top_n = ANALYSIS_CONFIG['top_n_products']
+        totals = self._rollup('product')
+        product_stats = pd.DataFrame({
+            ('units_sold', 'sum'): totals['units_sold'],
+            ('units_sold', 'mean'): totals['units_sold'] / totals['units_sold_count'],
+            ('revenue', 'sum'): totals['revenue'],
+            ('revenue', 'mean'): totals['revenue'] / totals['revenue_count']
         }).round(2)
         
         print("\n=== Product Performance ===")
         print(product_stats)
         
+        self._print_top_products(self.top_products(top_n), top_n)
         return product_stats
     
+    @staticmethod
+    def _print_top_products(top, n):
+        for measure, table in top.items():
+            print(f"\nTop {n} products by {measure.replace('_', ' ')}:")
+            print(table)
+    
+    def top_products(self, n=None, approximate=None):
+        """Top n products by revenue and by units sold, with error bounds.
+        
+        The approximate figures come from the bounded-memory heavy-hitters summaries built
+        chunk by chunk during the streaming pass; other load modes always use exact totals.
+        """
+        n = n or ANALYSIS_CONFIG['top_n_products']
+        approximate = PERFORMANCE_CONFIG['approximate_top_n'] if approximate is None else approximate
+        
+        if approximate and self.mode.top_products is not None:
+            return self.mode.top_products.top(n)
+        
+        totals = self._totals_by('product')
+        return {measure: exact_top(totals[measure], n) for measure in ['revenue', 'units_sold']}
+    
     def regional_analysis(self):
         """Analyze sales by region"""
-        region_stats = self.data.groupby('region').agg({
-            'units_sold': 'sum',
-            'revenue': 'sum'
-        }).sort_values('revenue', ascending=False)
+        region_stats = self._totals_by('region').sort_values('revenue', ascending=False)
         
         print("\n=== Regional Performance ===")
         print(region_stats)
@@ -90,37 +243,45 @@ class SalesAnalyzer:
     
     def create_visualizations(self):
         """Create basic visualizations"""
-        plt.style.use('seaborn-v0_8')
-        fig, axes = plt.subplots(2, 2, figsize=(15, 10))
-        
-        # Monthly revenue trend
-        monthly_data = self.monthly_trend_analysis()
-        axes[0,0].plot(monthly_data['date'], monthly_data['revenue'], marker='o', linewidth=2)
-        axes[0,0].set_title('Monthly Revenue Trend')
-        axes[0,0].set_ylabel('Revenue ($)')
-        axes[0,0].tick_params(axis='x', rotation=45)
-        
-        # Product sales
-        product_sales = self.data.groupby('product')['units_sold'].sum()
-        axes[0,1].bar(product_sales.index, product_sales.values, color='skyblue')
-        axes[0,1].set_title('Total Units Sold by Product')
-        axes[0,1].set_ylabel('Units Sold')
-        axes[0,1].tick_params(axis='x', rotation=45)
-        
-        # Regional revenue
-        region_revenue = self.data.groupby('region')['revenue'].sum()
-        axes[1,0].pie(region_revenue.values, labels=region_revenue.index, autopct='%1.1f%%')
-        axes[1,0].set_title('Revenue Distribution by Region')
-        
-        # Category performance
-        category_sales = self.data.groupby('category')['revenue'].sum()
-        axes[1,1].barh(category_sales.index, category_sales.values, color='lightgreen')
-        axes[1,1].set_title('Revenue by Category')
-        axes[1,1].set_xlabel('Revenue ($)')
-        
-        plt.tight_layout()
-        plt.savefig('results/sales_analysis_dashboard.png', dpi=300, bbox_inches='tight')
+        # Every panel is drawn from rollups of the shared aggregate, no rescan
+        inputs = {
+            'monthly': self._rollup('month')['revenue'],
+            'product_units': self._totals_by('product')['units_sold'],
+            'region_revenue': self._totals_by('region')['revenue'],
+            'category_revenue': self._totals_by('category')['revenue']
+        }
+        results_directory = OUTPUT_CONFIG['results_directory']
+        if VISUALIZATION_CONFIG['headless']:
+            # Rendered without a window and skipped when the aggregates have not changed
+            render_charts([('sales_analysis_dashboard.png', draw_dashboard, inputs)], results_directory,
+                          VISUALIZATION_CONFIG['dpi'], VISUALIZATION_CONFIG['style'])
+            return
+        
+        plt = load_pyplot()
+        draw_dashboard(plt, inputs)
+        plt.savefig(f"{results_directory}/sales_analysis_dashboard.png", dpi=VISUALIZATION_CONFIG['dpi'],
+                    bbox_inches='tight')
         plt.show()
+    
+    def region_dashboards(self, directory=None):
+        """Render one dashboard per region headlessly, in parallel, redrawing only changed regions"""
+        directory = directory or f"{OUTPUT_CONFIG['results_directory']}/region_dashboards"
+        by_region = self.get_aggregate().groupby(level='region', observed=True)
+        jobs = []
+        for region, rows in by_region:
+            jobs.append((f"region_{region}.png", draw_region_dashboard, {
+                'label': region,
+                'monthly': rows.groupby(level='month', observed=True)['revenue'].sum(),
+                'product_units': rows.groupby(level='product', observed=True)['units_sold'].sum(),
+                'category_revenue': rows.groupby(level='category', observed=True)['revenue'].sum()
+            }))
+        
+        start = time.perf_counter()
+        rendered, skipped = render_charts(jobs, directory, VISUALIZATION_CONFIG['group_dashboard_dpi'],
+                                          VISUALIZATION_CONFIG['style'],
+                                          VISUALIZATION_CONFIG['render_workers'] or os.cpu_count())
+        print(f"\n🖼️  Region dashboards: {rendered} rendered, {skipped} unchanged "
+              f"({time.perf_counter() - start:.2f}s) -> {directory}/")
 
     def save_results(self):
         """Save analysis results to files using config settings"""
@@ -128,17 +289,11 @@ class SalesAnalyzer:
         os.makedirs(OUTPUT_CONFIG['results_directory'], exist_ok=True)
         
         # Save product performance
-        product_stats = self.data.groupby('product').agg({
-            'units_sold': 'sum',
-            'revenue': 'sum'
-        }).round(2)
+        product_stats = self._totals_by('product').round(2)
         product_stats.to_csv(f"{OUTPUT_CONFIG['results_directory']}/product_performance.csv")
         
-        # Save regional analysis
-        region_stats = self.data.groupby('region').agg({
-            'units_sold': 'sum',
-            'revenue': 'sum'
-        }).sort_values('revenue', ascending=False)
+        # Save regional analysis (rounded like the product table so every mode writes identical files)
+        region_stats = self._totals_by('region').round(2).sort_values('revenue', ascending=False)
         
         regional_data = {
             'regional_performance': region_stats.reset_index().to_dict('records'),
@@ -157,7 +312,17 @@ class SalesAnalyzer:
         print("✅ Results saved using configuration settings!")
         print(f"📁 Location: {OUTPUT_CONFIG['results_directory']}/")
 
+def check_startup_budget():
+    """Report how long imports took against the configured startup budget"""
+    startup = time.perf_counter() - _STARTED
+    budget = PERFORMANCE_CONFIG['startup_budget_seconds']
+    status = "within" if startup <= budget else "⚠️  OVER"
+    print(f"Startup: {startup:.3f}s ({status} budget of {budget:.2f}s)")
+    return startup
+
 def main():
+    check_startup_budget()
+    
     # Initialize analyzer (will use config settings)
     analyzer = SalesAnalyzer()
     
@@ -0,0 +1,216 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import psutil
+
+from analysis import SalesAnalyzer
+from settings import ANALYSIS_CONFIG, OUTPUT_CONFIG, PERFORMANCE_CONFIG
+
+BENCHMARK_DATA_DIR = 'data/benchmarks'
+BENCHMARK_RESULTS_DIR = 'results/benchmarks'
+
+# PERFORMANCE_CONFIG overrides for each benchmarked execution mode
+MODES = {
+    'memory': {'cache_parsed_data': False},
+    'cached': {'cache_parsed_data': True},
+    'compact': {'cache_parsed_data': False, 'compact_dtypes': True},
+    'streaming': {'streaming': True},
+    'parallel': {'streaming': True, 'workers': None}
+}
+
+CATEGORIES = ['Electronics', 'Home Appliances', 'Clothing', 'Books', 'Sports', 'Toys']
+GENERATE_CHUNK_ROWS = 1_000_000  # Rows generated and written at a time
+RSS_SAMPLE_SECONDS = 0.01  # Interval between resident memory samples
+
+
+def generate_sales_data(path, rows, products=1000, days=730, *, seed=42):
+    """Write a synthetic sales file with the sales_data.csv schema, in date order"""
+    rng = np.random.default_rng(seed)
+    start = pd.Timestamp('2022-01-01')
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+
+    with open(path, 'w') as f:
+        for offset in range(0, rows, GENERATE_CHUNK_ROWS):
+            n = min(GENERATE_CHUNK_ROWS, rows - offset)
+            # Spread days evenly over the whole file so it stays sorted by date
+            day = (np.arange(offset, offset + n) * days) // rows
+            product_id = rng.integers(0, products, n)
+            units = rng.integers(1, 300, n)
+            chunk = pd.DataFrame({
+                'date': (start + pd.to_timedelta(day, unit='D')).strftime('%Y-%m-%d'),
+                'product': [f"Product {i}" for i in product_id],
+                'category': np.asarray(CATEGORIES)[product_id % len(CATEGORIES)],
+                'units_sold': units,
+                'revenue': np.round(units * (5 + product_id % 95) * rng.uniform(0.9, 1.1, n), 2),
+                'region': rng.choice(ANALYSIS_CONFIG['regions'], n)
+            })
+            chunk.to_csv(f, index=False, header=offset == 0)
+
+
+class PeakRss:
+    """Track the peak resident memory of this process plus its worker processes.
+
+    A background thread samples RSS, so memory held by worker processes and by
+    native (e.g. Arrow) buffers counts too, and the measured code runs untraced.
+    """
+
+    def __init__(self, interval=RSS_SAMPLE_SECONDS):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def sample(self):
+        total = self.process.memory_info().rss
+        for child in self.process.children(recursive=True):
+            try:
+                total += child.memory_info().rss
+            except psutil.Error:
+                pass  # worker exited between listing and sampling
+        self.peak_mb = max(self.peak_mb, total / 1024 ** 2)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def __enter__(self):
+        self.sample()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._stop.set()
+        self._thread.join()
+        self.sample()
+
+
+def _measure(stage):
+    """Run a stage with its output silenced and return (seconds, peak resident MB)"""
+    with PeakRss() as memory, contextlib.redirect_stdout(io.StringIO()):
+        start = time.perf_counter()
+        stage()
+        seconds = time.perf_counter() - start
+    return {'seconds': round(seconds, 4), 'peak_rss_mb': round(memory.peak_mb, 2)}
+
+
+def run_benchmark(data_path, mode):
+    """Time and memory-profile each SalesAnalyzer stage on one file"""
+    saved = dict(PERFORMANCE_CONFIG)
+    saved_results_directory = OUTPUT_CONFIG['results_directory']
+    PERFORMANCE_CONFIG.update(MODES[mode])
+    analyzers = []
+    stages = {}
+
+    try:
+        with tempfile.TemporaryDirectory() as results_directory:
+            OUTPUT_CONFIG['results_directory'] = results_directory
+
+            def load():
+                analyzer = SalesAnalyzer(data_path)
+                analyzer.load_data()
+                analyzer.get_aggregate()
+                analyzers.append(analyzer)
+
+            stages['load'] = _measure(load)
+            analyzer = analyzers[0]
+            stages['monthly_trend'] = _measure(analyzer.monthly_trend_analysis)
+            stages['product'] = _measure(analyzer.product_performance)
+            stages['regional'] = _measure(analyzer.regional_analysis)
+            stages['save'] = _measure(analyzer.save_results)
+            rows = analyzer.row_count
+    finally:
+        PERFORMANCE_CONFIG.clear()
+        PERFORMANCE_CONFIG.update(saved)
+        OUTPUT_CONFIG['results_directory'] = saved_results_directory
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'mode': mode,
+        'rows': rows,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'cpu_count': os.cpu_count(),
+        'total_seconds': round(sum(stage['seconds'] for stage in stages.values()), 4),
+        'stages': stages
+    }
+
+
+def compare_results(baseline, current, tolerance=0.10):
+    """List stages that got slower or used more memory than tolerance allows"""
+    regressions = []
+    for stage, now in current['stages'].items():
+        before = baseline['stages'].get(stage)
+        if before is None:
+            continue
+        for metric in ['seconds', 'peak_rss_mb']:
+            if metric not in before:
+                continue  # recorded by an older version of this script
+            if before[metric] > 0 and now[metric] > before[metric] * (1 + tolerance):
+                change = (now[metric] / before[metric] - 1) * 100
+                regressions.append(f"{stage} {metric}: {before[metric]} -> {now[metric]} (+{change:.1f}%)")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the sales analysis pipeline")
+    parser.add_argument('--rows', type=float, nargs='+', default=[1e5],
+                        help="row counts to benchmark, e.g. 1e5 1e6 1e7")
+    parser.add_argument('--modes', nargs='+', default=['memory'], choices=sorted(MODES))
+    parser.add_argument('--baseline', help="earlier results file to check for regressions")
+    parser.add_argument('--tolerance', type=float, default=0.10,
+                        help="allowed slowdown before a stage counts as a regression")
+    args = parser.parse_args()
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = {(run['mode'], run['rows']): run for run in json.load(f)['runs']}
+
+    runs = []
+    regressions = []
+    for rows in [int(rows) for rows in args.rows]:
+        data_path = f"{BENCHMARK_DATA_DIR}/sales_{rows}.csv"
+        if not os.path.exists(data_path):
+            print(f"Generating {rows:,} synthetic rows -> {data_path}")
+            generate_sales_data(data_path, rows)
+
+        for mode in args.modes:
+            result = run_benchmark(data_path, mode)
+            runs.append(result)
+            print(f"\n=== {mode} | {rows:,} rows | {result['total_seconds']:.2f}s ===")
+            for stage, metrics in result['stages'].items():
+                print(f"  {stage:<14} {metrics['seconds']:>9.3f}s {metrics['peak_rss_mb']:>10.1f} MB peak RSS")
+
+            if baseline and (mode, result['rows']) in baseline:
+                found = compare_results(baseline[(mode, result['rows'])], result, args.tolerance)
+                regressions.extend(f"[{mode} {rows:,}] {item}" for item in found)
+
+    os.makedirs(BENCHMARK_RESULTS_DIR, exist_ok=True)
+    output_path = f"{BENCHMARK_RESULTS_DIR}/benchmark_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
+    with open(output_path, 'w') as f:
+        json.dump({'runs': runs}, f, indent=2)
+    print(f"\n📁 Results saved to {output_path}")
+
+    if baseline:
+        if regressions:
+            print("\n⚠️  Regressions against baseline:")
+            for item in regressions:
+                print(f"  {item}")
+            sys.exit(1)
+        print("\n✅ No regressions against baseline")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,81 @@
+from collections import namedtuple
+
+import pandas as pd
+
+from sales_dtypes import widen
+
+# Grain of the partial aggregates: every report can be rolled up from these keys
+AGGREGATE_KEYS = ['month', 'product', 'category', 'region']
+VALUE_COLUMNS = ['units_sold', 'revenue']
+
+# How a sales CSV is read: rows per chunk, the date column, and categorical labels or not
+ChunkOptions = namedtuple('ChunkOptions', ['chunk_size', 'date_column', 'compact'],
+                          defaults=['date', False])
+
+
+def empty_aggregate():
+    """Return an aggregate with no rows but the expected layout"""
+    index = pd.MultiIndex.from_arrays([[] for _ in AGGREGATE_KEYS], names=AGGREGATE_KEYS)
+    return pd.DataFrame({'units_sold': pd.Series(dtype='int64'),
+                         'revenue': pd.Series(dtype='float64'),
+                         'units_sold_count': pd.Series(dtype='int64'),
+                         'revenue_count': pd.Series(dtype='int64')}, index=index)
+
+
+def aggregate_chunk(chunk, date_column='date'):
+    """Reduce a block of raw sales rows to a partial aggregate"""
+    months = pd.to_datetime(chunk[date_column]).dt.to_period('M').dt.to_timestamp()
+    keys = [months.rename('month')] + [chunk[column] for column in AGGREGATE_KEYS[1:]]
+    values = widen(chunk[VALUE_COLUMNS])
+
+    return values.groupby(keys, observed=True, dropna=False, sort=False).agg(
+        units_sold=('units_sold', 'sum'),
+        revenue=('revenue', 'sum'),
+        # Non-missing values per measure, so means skip missing values like a plain groupby mean
+        units_sold_count=('units_sold', 'count'),
+        revenue_count=('revenue', 'count')
+    )
+
+
+def merge_partials(partials):
+    """Combine partial aggregates into one (sums and counts are additive)"""
+    partials = [partial for partial in partials if partial is not None and len(partial)]
+    if not partials:
+        return empty_aggregate()
+    if len(partials) == 1:
+        return partials[0]
+
+    return pd.concat(partials).groupby(level=AGGREGATE_KEYS, observed=True,
+                                       dropna=False, sort=False).sum()
+
+
+def aggregate_chunks(chunks, date_column='date', top=None):
+    """Fold an iterable of raw row chunks into one aggregate.
+
+    If top (a sales_topn.TopProducts) is given, each chunk's product totals are also
+    folded into its summaries.
+    """
+    aggregate = empty_aggregate()
+    rows = 0
+
+    for chunk in chunks:
+        rows += len(chunk)
+        partial = aggregate_chunk(chunk, date_column)
+        if top is not None:
+            top.update(partial)
+        aggregate = merge_partials([aggregate, partial])
+
+    return aggregate, rows
+
+
+def read_dtypes(compact):
+    """Column dtypes for read_csv: parse labels straight into categoricals in compact mode"""
+    return {column: 'category' for column in AGGREGATE_KEYS[1:]} if compact else None
+
+
+def stream_aggregate(data_path, options, top=None):
+    """Aggregate a CSV file chunk by chunk, keeping only the running totals in memory"""
+    usecols = [options.date_column] + AGGREGATE_KEYS[1:] + VALUE_COLUMNS
+    chunks = pd.read_csv(data_path, usecols=usecols, dtype=read_dtypes(options.compact),
+                         chunksize=options.chunk_size)
+    return aggregate_chunks(chunks, options.date_column, top)
@@ -0,0 +1,82 @@
+import json
+import os
+import time
+
+import pandas as pd
+
+try:
+    import pyarrow  # Parquet engine, optional
+    CACHE_FORMAT = 'parquet'
+except ImportError:
+    CACHE_FORMAT = 'pickle'
+
+
+def cache_paths(data_path):
+    """Cache file and its key file, stored next to the source file"""
+    base = f"{data_path}.cache"
+    return f"{base}.{CACHE_FORMAT}", f"{base}.json"
+
+
+def source_key(data_path, variant=None):
+    """Identify a version of the source file by path, size and modification time"""
+    stat = os.stat(data_path)
+    return {
+        'source': os.path.abspath(data_path),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'format': CACHE_FORMAT,
+        'variant': variant
+    }
+
+
+def read_frame(path):
+    """Read a frame written by write_frame"""
+    if CACHE_FORMAT == 'parquet':
+        return pd.read_parquet(path)
+    return pd.read_pickle(path)
+
+
+def write_frame(frame, path):
+    """Write a frame in the cache format"""
+    # Write to a temporary name first so an interrupted run never leaves a torn file
+    temp_path = f"{path}.tmp"
+    if CACHE_FORMAT == 'parquet':
+        frame.to_parquet(temp_path, index=False)
+    else:
+        frame.to_pickle(temp_path)
+    os.replace(temp_path, path)
+
+
+def load_with_cache(data_path, parse, variant=None):
+    """Return the parsed frame for data_path, reusing the on-disk cache when it is current.
+
+    parse is called with data_path on a cache miss and must return the typed frame.
+    variant describes parse options that change the result, such as compact dtypes.
+    The second return value describes what happened for reporting.
+    """
+    cache_file, key_file = cache_paths(data_path)
+    key = source_key(data_path, variant)
+    start = time.perf_counter()
+
+    try:
+        with open(key_file, 'r') as f:
+            cached_key = json.load(f)
+        if cached_key == key and os.path.exists(cache_file):
+            frame = read_frame(cache_file)
+            return frame, {'status': 'hit', 'format': CACHE_FORMAT,
+                           'seconds': time.perf_counter() - start, 'cache_file': cache_file}
+    except (FileNotFoundError, ValueError, OSError):
+        pass
+
+    frame = parse(data_path)
+    parse_seconds = time.perf_counter() - start
+
+    try:
+        write_frame(frame, cache_file)
+        with open(key_file, 'w') as f:
+            json.dump(key, f, indent=2)
+    except OSError as e:
+        print(f"Could not write data cache {cache_file}: {e}")
+
+    return frame, {'status': 'miss', 'format': CACHE_FORMAT,
+                   'seconds': parse_seconds, 'cache_file': cache_file}
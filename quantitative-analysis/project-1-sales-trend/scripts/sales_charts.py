@@ -0,0 +1,154 @@
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import pandas as pd
+
+CACHE_FILE = 'chart_cache.json'
+
+
+@lru_cache(maxsize=None)
+def _module_source(module_name):
+    """Source bytes of the module defining a draw function"""
+    with open(sys.modules[module_name].__file__, 'rb') as f:
+        return f.read()
+
+
+def chart_key(draw, inputs, dpi, style):
+    """Content hash of everything that decides how a chart looks"""
+    digest = hashlib.sha256()
+    digest.update(f"{draw.__module__}.{draw.__qualname__}|{dpi}|{style}".encode())
+    # Editing the draw function, the helpers it calls or its constants invalidates its charts
+    digest.update(_module_source(draw.__module__))
+    for name in sorted(inputs):
+        value = inputs[name]
+        digest.update(name.encode())
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            labels = value.columns if isinstance(value, pd.DataFrame) else value.name
+            digest.update(repr(labels).encode())
+            digest.update(pd.util.hash_pandas_object(value).to_numpy().tobytes())
+        else:
+            digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+
+def _render(path, draw, inputs, dpi, style):
+    """Worker: draw one figure with the Agg backend and write it atomically"""
+    import matplotlib  # pylint: disable=import-outside-toplevel
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+    plt.style.use(style)
+
+    fig = draw(plt, inputs)
+    root, extension = os.path.splitext(path)
+    temporary = f"{root}.tmp{extension}"
+    fig.savefig(temporary, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    os.replace(temporary, path)
+    return path
+
+
+def _stale_jobs(jobs, directory, cache, dpi, style):
+    """Jobs whose chart is missing or was drawn from other inputs, as
+    (filename, key, path, draw, inputs); their old cache entries are dropped"""
+    pending = []
+    for filename, draw, inputs in jobs:
+        key = chart_key(draw, inputs, dpi, style)
+        path = os.path.join(directory, filename)
+        if cache.get(filename) == key and os.path.exists(path):
+            continue
+        cache.pop(filename, None)
+        pending.append((filename, key, path, draw, inputs))
+    return pending
+
+
+def _render_all(pending, dpi, style, workers):
+    """Render stale jobs, in worker processes when workers > 1; yield (filename, key) per chart"""
+    if workers == 1 or len(pending) < 2:
+        for filename, key, path, draw, inputs in pending:
+            _render(path, draw, inputs, dpi, style)
+            yield filename, key
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {filename: (key, executor.submit(_render, path, draw, inputs, dpi, style))
+                   for filename, key, path, draw, inputs in pending}
+        for filename, (key, future) in futures.items():
+            future.result()
+            yield filename, key
+
+
+def render_charts(jobs, directory, dpi, style, workers=1):
+    """Render (filename, draw, inputs) jobs headlessly, skipping charts whose inputs are unchanged.
+
+    draw(plt, inputs) must be a module-level function returning the figure, so it can
+    run in a worker process. Returns (rendered, skipped) counts.
+    """
+    os.makedirs(directory, exist_ok=True)
+    cache_path = os.path.join(directory, CACHE_FILE)
+    cache = {}
+    if os.path.exists(cache_path):
+        with open(cache_path, 'r') as f:
+            cache = json.load(f)
+
+    pending = _stale_jobs(jobs, directory, cache, dpi, style)
+    for filename, key in _render_all(pending, dpi, style, workers):
+        cache[filename] = key
+
+    with open(cache_path, 'w') as f:
+        json.dump(cache, f, indent=2)
+    return len(pending), len(jobs) - len(pending)
+
+
+def draw_dashboard(plt, inputs):
+    """Monthly revenue, units per product, revenue share per region and revenue per category"""
+    fig, axes = plt.subplots(2, 2, figsize=(15, 10))
+
+    _draw_monthly_revenue(axes[0,0], inputs['monthly'])
+    _draw_product_units(axes[0,1], inputs['product_units'])
+
+    # Regional revenue
+    region_revenue = inputs['region_revenue']
+    axes[1,0].pie(region_revenue.values, labels=region_revenue.index, autopct='%1.1f%%')
+    axes[1,0].set_title('Revenue Distribution by Region')
+
+    _draw_category_revenue(axes[1,1], inputs['category_revenue'])
+
+    fig.tight_layout()
+    return fig
+
+
+def draw_region_dashboard(plt, inputs):
+    """Monthly revenue, units per product and revenue per category for one region"""
+    fig, axes = plt.subplots(1, 3, figsize=(18, 5))
+    fig.suptitle(f"{inputs['label']} Region")
+
+    _draw_monthly_revenue(axes[0], inputs['monthly'])
+    _draw_product_units(axes[1], inputs['product_units'])
+    _draw_category_revenue(axes[2], inputs['category_revenue'])
+
+    fig.tight_layout()
+    return fig
+
+
+def _draw_monthly_revenue(axis, monthly):
+    axis.plot(monthly.index, monthly.values, marker='o', linewidth=2)
+    axis.set_title('Monthly Revenue Trend')
+    axis.set_ylabel('Revenue ($)')
+    axis.tick_params(axis='x', rotation=45)
+
+
+def _draw_product_units(axis, product_units):
+    axis.bar(product_units.index, product_units.values, color='skyblue')
+    axis.set_title('Total Units Sold by Product')
+    axis.set_ylabel('Units Sold')
+    axis.tick_params(axis='x', rotation=45)
+
+
+def _draw_category_revenue(axis, category_revenue):
+    axis.barh(category_revenue.index, category_revenue.values, color='lightgreen')
+    axis.set_title('Revenue by Category')
+    axis.set_xlabel('Revenue ($)')
@@ -0,0 +1,38 @@
+import pandas as pd
+
+
+def memory_usage_mb(frame):
+    """Deep memory footprint of a frame in megabytes"""
+    return frame.memory_usage(deep=True).sum() / 1024 ** 2
+
+
+def compact_frame(frame, category_columns, value_columns, downcast_floats=False):
+    """Store repeated labels as categoricals and numbers in the narrowest safe dtype.
+
+    Integers are downcast losslessly. Floats are only narrowed to float32 when
+    downcast_floats is set, because that rounds values such as revenue.
+    """
+    for column in category_columns:
+        if column in frame.columns and not isinstance(frame[column].dtype, pd.CategoricalDtype):
+            frame[column] = frame[column].astype('category')
+
+    for column in value_columns:
+        if column not in frame.columns:
+            continue
+        if pd.api.types.is_integer_dtype(frame[column]):
+            frame[column] = pd.to_numeric(frame[column], downcast='integer')
+        elif downcast_floats and pd.api.types.is_float_dtype(frame[column]):
+            frame[column] = pd.to_numeric(frame[column], downcast='float')
+
+    return frame
+
+
+def widen(values):
+    """Upcast narrow numeric columns so sums accumulate in 64 bits"""
+    wide = {}
+    for column, dtype in values.dtypes.items():
+        if pd.api.types.is_integer_dtype(dtype) and dtype.itemsize < 8:
+            wide[column] = 'int64'
+        elif pd.api.types.is_float_dtype(dtype) and dtype.itemsize < 8:
+            wide[column] = 'float64'
+    return values.astype(wide) if wide else values
@@ -0,0 +1,125 @@
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+from sales_aggregates import (AGGREGATE_KEYS, VALUE_COLUMNS, ChunkOptions, aggregate_chunks, empty_aggregate,
+                              merge_partials, read_dtypes, stream_aggregate)
+from sales_cache import CACHE_FORMAT, read_frame, write_frame
+
+# Read size while hashing the processed history
+HASH_BLOCK_BYTES = 1024 * 1024
+
+
+def state_paths(state_path):
+    """Aggregate file and metadata file for a saved incremental state"""
+    return f"{state_path}.{CACHE_FORMAT}", f"{state_path}.json"
+
+
+def _hash_next(f, digest, length):
+    """Feed the next length bytes of f to digest; return the last block read"""
+    block = b''
+    while length > 0:
+        block = f.read(min(HASH_BLOCK_BYTES, length))
+        if not block:
+            break
+        digest.update(block)
+        length -= len(block)
+    return block
+
+
+def _fingerprint(data_path, offset, size):
+    """Hash every byte before offset, then carry on to size, in one sequential read.
+
+    Returns (digest of the first offset bytes, whether they end with a newline,
+    digest of the first size bytes).
+    """
+    digest = hashlib.sha256()
+    with open(data_path, 'rb') as f:
+        last = _hash_next(f, digest, offset)
+        processed = digest.hexdigest()
+        _hash_next(f, digest, size - offset)
+    return processed, last.endswith(b'\n'), digest.hexdigest()
+
+
+def _load_state(state_path):
+    aggregate_file, meta_file = state_paths(state_path)
+    try:
+        with open(meta_file, 'r') as f:
+            meta = json.load(f)
+        aggregate = read_frame(aggregate_file).set_index(AGGREGATE_KEYS)
+    except (FileNotFoundError, ValueError, KeyError, OSError):
+        return None, None
+    if list(aggregate.columns) != list(empty_aggregate().columns):
+        return None, None  # saved by a version with a different aggregate layout
+    return aggregate, meta
+
+
+def _save_state(state_path, aggregate, meta):
+    aggregate_file, meta_file = state_paths(state_path)
+    os.makedirs(os.path.dirname(aggregate_file) or '.', exist_ok=True)
+    write_frame(aggregate.reset_index(), aggregate_file)
+    with open(meta_file, 'w') as f:
+        json.dump(meta, f, indent=2)
+
+
+def _check_history(data_path, meta, size):
+    """Return why the saved state can't be extended (None if only rows were appended),
+    together with the fingerprint of the whole file to save with the new state"""
+    offset = min(meta['offset'], size) if meta else 0
+    processed, ends_with_newline, fingerprint = _fingerprint(data_path, offset, size)
+    if meta is None:
+        return 'no saved state', fingerprint
+    if meta['source'] != os.path.abspath(data_path):
+        return 'state belongs to another source file', fingerprint
+    if size < meta['offset']:
+        return 'source file shrank', fingerprint
+    if processed != meta['fingerprint']:
+        return 'processed history was rewritten', fingerprint
+    if size > meta['offset'] and not ends_with_newline:
+        return 'last processed row was incomplete', fingerprint
+    return None, fingerprint
+
+
+def _read_appended(data_path, offset, chunk_size, date_column, compact):
+    """Yield chunks of the rows written after offset"""
+    columns = pd.read_csv(data_path, nrows=0).columns
+    usecols = [date_column] + AGGREGATE_KEYS[1:] + VALUE_COLUMNS
+    with open(data_path, 'rb') as f:
+        f.seek(offset)
+        yield from pd.read_csv(f, header=None, names=columns, usecols=usecols,
+                               dtype=read_dtypes(compact), chunksize=chunk_size)
+
+
+def update_aggregate(data_path, state_path, chunk_size, date_column='date', compact=False):
+    """Bring the saved aggregate state up to date with data_path.
+
+    Only rows appended since the last run are read. If the already processed part of
+    the file changed, the aggregate is rebuilt from scratch instead.
+    """
+    size = os.path.getsize(data_path)
+    aggregate, meta = _load_state(state_path)
+    reason, fingerprint = _check_history(data_path, meta, size)
+
+    if reason is None:
+        new_part, new_rows = empty_aggregate(), 0
+        if size > meta['offset']:
+            new_part, new_rows = aggregate_chunks(
+                _read_appended(data_path, meta['offset'], chunk_size, date_column, compact), date_column)
+        aggregate = merge_partials([aggregate, new_part])
+        rows = meta['rows'] + new_rows
+        info = {'mode': 'incremental', 'new_rows': new_rows}
+    else:
+        aggregate, rows = stream_aggregate(data_path, ChunkOptions(chunk_size, date_column, compact))
+        info = {'mode': 'full rebuild', 'reason': reason, 'new_rows': rows}
+
+    _save_state(state_path, aggregate, {
+        'source': os.path.abspath(data_path),
+        'offset': size,
+        'rows': rows,
+        'fingerprint': fingerprint
+    })
+
+    info['rows'] = rows
+    return aggregate, info
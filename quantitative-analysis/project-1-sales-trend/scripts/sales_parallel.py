@@ -0,0 +1,94 @@
+import io
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from sales_aggregates import AGGREGATE_KEYS, VALUE_COLUMNS, aggregate_chunks, merge_partials, read_dtypes
+from sales_topn import TopProducts
+
+
+class _ByteRange(io.RawIOBase):
+    """Read-only view of the bytes [start, end) of an open binary file"""
+
+    def __init__(self, f, start, end):
+        super().__init__()
+        self.f = f
+        self.end = end
+        self.f.seek(start)
+
+    def readable(self):
+        return True
+
+    def readinto(self, b):
+        remaining = self.end - self.f.tell()
+        if remaining <= 0:
+            return 0
+        view = memoryview(b)[:min(len(b), remaining)]
+        return self.f.readinto(view)
+
+
+def partition_ranges(data_path, partitions):
+    """Split the rows of a CSV file into contiguous byte ranges that start on a line.
+
+    Daily exports are written in date order, so each range covers a date range.
+    """
+    size = os.path.getsize(data_path)
+    with open(data_path, 'rb') as f:
+        f.readline()  # skip the header
+        body_start = f.tell()
+        step = max(1, (size - body_start) // partitions)
+
+        bounds = [body_start]
+        for i in range(1, partitions):
+            target = max(body_start + i * step, bounds[-1])
+            if target >= size:
+                break
+            f.seek(target)
+            f.readline()  # move to the start of the next full line
+            if f.tell() >= size:
+                break
+            bounds.append(f.tell())
+        bounds.append(size)
+
+    return [(start, end) for start, end in zip(bounds, bounds[1:]) if end > start]
+
+
+def _aggregate_range(task):
+    """Worker: aggregate the rows stored in one byte range of the file.
+
+    task is a (data_path, start, end, options, top_capacity) tuple; with a top_capacity the
+    worker also builds its own top-products summary and returns it with the aggregate.
+    """
+    data_path, start, end, options, top_capacity = task
+    top = TopProducts(top_capacity) if top_capacity else None
+    columns = pd.read_csv(data_path, nrows=0).columns
+    usecols = [options.date_column] + AGGREGATE_KEYS[1:] + VALUE_COLUMNS
+    with open(data_path, 'rb') as f:
+        stream = io.BufferedReader(_ByteRange(f, start, end))
+        chunks = pd.read_csv(stream, header=None, names=columns, usecols=usecols,
+                             dtype=read_dtypes(options.compact), chunksize=options.chunk_size)
+        aggregate, rows = aggregate_chunks(chunks, options.date_column, top)
+    return aggregate, rows, top
+
+
+def parallel_aggregate(data_path, workers, options, top=None):
+    """Aggregate a CSV file with one worker process per partition and merge the results.
+
+    If top (a TopProducts) is given, the workers' top-products summaries are merged into it.
+    """
+    workers = workers or os.cpu_count()
+    ranges = partition_ranges(data_path, workers)
+    if not ranges:
+        return merge_partials([]), 0
+
+    top_capacity = top.capacity if top is not None else 0
+    with ProcessPoolExecutor(max_workers=min(workers, len(ranges))) as executor:
+        tasks = [(data_path, start, end, options, top_capacity) for start, end in ranges]
+        results = list(executor.map(_aggregate_range, tasks))
+
+    if top is not None:
+        for _, _, worker_top in results:
+            top.merge(worker_top)
+    aggregate = merge_partials([partial for partial, _, _ in results])
+    return aggregate, sum(rows for _, rows, _ in results)
@@ -0,0 +1,83 @@
+import pandas as pd
+
+
+class HeavyHitters:
+    """Mergeable Space-Saving summary that tracks the largest totals in bounded memory.
+
+    At most `capacity` items are kept. For every tracked item the true total lies in
+    [estimate - error, estimate]; an untracked item's total is at most `floor`.
+    Weights must be non-negative for these bounds to hold.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.counters = pd.DataFrame({'estimate': pd.Series(dtype='float64'),
+                                      'error': pd.Series(dtype='float64')})
+        self.floor = 0.0
+
+    def update(self, totals):
+        """Fold in exact totals for a block of rows (a Series indexed by item)"""
+        exact = pd.DataFrame({'estimate': totals.astype('float64'), 'error': 0.0})
+        exact.index = pd.Index(exact.index, dtype=object)  # chunks have differing categories
+        self._combine(exact, 0.0)
+
+    def merge(self, other):
+        """Fold in another summary, e.g. one built by a different worker"""
+        self._combine(other.counters, other.floor)
+
+    def _combine(self, counters, floor):
+        # An item missing from one side may have been counted there up to that side's floor
+        left, right = self.counters.align(counters, join='outer')
+        left = left.fillna({'estimate': self.floor, 'error': self.floor})
+        right = right.fillna({'estimate': floor, 'error': floor})
+        combined = left + right
+        self.floor += floor
+
+        if len(combined) > self.capacity:
+            combined = combined.sort_values('estimate', ascending=False)
+            self.floor = max(self.floor, combined['estimate'].iloc[self.capacity])
+            combined = combined.iloc[:self.capacity]
+        self.counters = combined
+
+    def top(self, n):
+        """The n largest items with their error bounds"""
+        ranked = self.counters.sort_values('estimate', ascending=False)
+        top = ranked.iloc[:n].copy()
+        top['lower_bound'] = top['estimate'] - top['error']
+
+        # Guaranteed in the true top n if it beats anything ranked below it could be worth
+        runner_up = ranked['estimate'].iloc[n] if len(ranked) > n else 0.0
+        top['guaranteed'] = top['lower_bound'] >= max(runner_up, self.floor)
+        return top[['estimate', 'lower_bound', 'error', 'guaranteed']]
+
+
+def exact_top(totals, n):
+    """Top n from exact totals, in the same layout as HeavyHitters.top"""
+    top = totals.nlargest(n).astype('float64').to_frame('estimate')
+    top['lower_bound'] = top['estimate']
+    top['error'] = 0.0
+    top['guaranteed'] = True
+    return top
+
+
+class TopProducts:
+    """One HeavyHitters summary per measure, fed with product totals chunk by chunk"""
+
+    def __init__(self, capacity, measures=('revenue', 'units_sold')):
+        self.capacity = capacity
+        self.summaries = {measure: HeavyHitters(capacity) for measure in measures}
+
+    def update(self, partial):
+        """Fold in a partial aggregate (indexed by a 'product' level) of one chunk of rows"""
+        totals = partial.groupby(level='product', observed=True)[list(self.summaries)].sum()
+        for measure, summary in self.summaries.items():
+            summary.update(totals[measure])
+
+    def merge(self, other):
+        """Fold in the summaries another worker built over a different part of the file"""
+        for measure, summary in self.summaries.items():
+            summary.merge(other.summaries[measure])
+
+    def top(self, n):
+        """The n largest products per measure, in HeavyHitters.top layout"""
+        return {measure: summary.top(n) for measure, summary in self.summaries.items()}
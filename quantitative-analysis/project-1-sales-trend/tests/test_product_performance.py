@@ -0,0 +1,26 @@
+import os
+import sys
+
+PROJECT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(os.path.join(PROJECT, 'config'))
+sys.path.append(os.path.join(PROJECT, 'scripts'))
+from analysis import SalesAnalyzer
+
+ROWS = """date,product,category,units_sold,revenue,region
+2024-01-01,Product A,Books,10,100,North
+2024-01-02,Product A,Books,,50,North
+2024-01-03,Product A,Books,20,,South
+"""
+
+
+def test_means_skip_missing_values(tmp_path):
+    data_path = tmp_path / 'sales.csv'
+    data_path.write_text(ROWS)
+
+    for streaming in (False, True):
+        stats = SalesAnalyzer(str(data_path), streaming=streaming).product_performance()
+        row = stats.loc['Product A']
+        assert row[('units_sold', 'sum')] == 30
+        assert row[('units_sold', 'mean')] == 15.0
+        assert row[('revenue', 'sum')] == 150
+        assert row[('revenue', 'mean')] == 75.0
@@ -0,0 +1,46 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from sales_incremental import update_aggregate
+
+HEADER = "date,product,category,units_sold,revenue,region\n"
+
+
+def _write_rows(path, rows, mode='w'):
+    with open(path, mode) as f:
+        if mode == 'w':
+            f.write(HEADER)
+        for day, units in rows:
+            f.write(f"2024-01-{day:02d},Product A,Books,{units},{units * 10.0},North\n")
+
+
+def test_appended_rows_are_folded_in(tmp_path):
+    data_path, state_path = tmp_path / 'sales.csv', str(tmp_path / 'state')
+    _write_rows(data_path, [(day, 100) for day in range(1, 21)])
+    update_aggregate(str(data_path), state_path, chunk_size=5)
+
+    _write_rows(data_path, [(21, 7)], mode='a')
+    aggregate, info = update_aggregate(str(data_path), state_path, chunk_size=5)
+
+    assert info['mode'] == 'incremental'
+    assert info['new_rows'] == 1
+    assert aggregate['units_sold'].sum() == 2007
+
+
+def test_edited_history_triggers_rebuild(tmp_path):
+    data_path, state_path = tmp_path / 'sales.csv', str(tmp_path / 'state')
+    # Enough rows that the edited one is far from both ends of the processed bytes
+    rows = [(1 + day % 28, 100) for day in range(20000)]
+    _write_rows(data_path, rows)
+    update_aggregate(str(data_path), state_path, chunk_size=5000)
+
+    # Same-length edit of one row in the middle, then append a row
+    rows[10000] = (rows[10000][0], 108)
+    _write_rows(data_path, rows)
+    _write_rows(data_path, [(1, 100)], mode='a')
+    aggregate, info = update_aggregate(str(data_path), state_path, chunk_size=5000)
+
+    assert info['mode'] == 'full rebuild'
+    assert info['reason'] == 'processed history was rewritten'
+    assert aggregate['units_sold'].sum() == 20001 * 100 + 8
@@ -0,0 +1,37 @@
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'scripts'))
+from sales_aggregates import ChunkOptions, stream_aggregate
+from sales_parallel import parallel_aggregate
+from sales_topn import TopProducts, exact_top
+
+HEADER = "date,product,category,units_sold,revenue,region\n"
+
+
+def _write_skewed(path):
+    # A few heavy products among a long tail of products sold once
+    with open(path, 'w') as f:
+        f.write(HEADER)
+        for i in range(400):
+            product = f"Product {i % 8 // 2}" if i % 2 else f"Tail {i}"
+            units = 50 if i % 2 else 1
+            f.write(f"2024-01-{i % 28 + 1:02d},{product},Books,{units},{units * 10.0},North\n")
+
+
+def test_top_products_tracked_while_streaming(tmp_path):
+    data_path = str(tmp_path / 'sales.csv')
+    _write_skewed(data_path)
+    options = ChunkOptions(chunk_size=37)
+
+    for run in (lambda top: stream_aggregate(data_path, options, top),
+                lambda top: parallel_aggregate(data_path, 3, options, top)):
+        top = TopProducts(capacity=20)
+        aggregate, _ = run(top)
+        totals = aggregate.groupby(level='product').sum()
+
+        for measure, table in top.top(4).items():
+            exact = exact_top(totals[measure], 4)
+            assert set(table.index) == set(exact.index)
+            assert table['guaranteed'].all()
+            assert (table['lower_bound'] <= exact.loc[table.index, 'estimate']).all()
@@ -6,7 +6,12 @@ DATA_CONFIG = {
     'primary_key': 'student_id',
     'score_column': 'score',
     'categorical_columns': ['class', 'subject', 'parent_education', 'extracurricular'],
-    'numerical_columns': ['score', 'attendance', 'study_hours']
+    'numerical_columns': ['score', 'attendance', 'study_hours'],
+    'value_ranges': {  # Valid range per numerical column, mirrors quality_checks in analysis_config.json
+        'score': (0, 100),
+        'attendance': (0, 100),
+        'study_hours': (0, 24)
+    }
 }
 
 # Analysis Configuration
@@ -37,7 +42,19 @@ VISUALIZATION_CONFIG = {
     },
     'figure_size': (12, 8),
     'dpi': 300,
-    'save_format': 'png'
+    'save_format': 'png',
+    'headless': False,  # Render charts to files only; plotting libraries load on first chart
+    'group_dashboard_dpi': 100,  # Resolution of the per-class dashboards
+    'render_workers': 1  # Processes rendering per-class dashboards, None uses every core
+}
+
+# Performance Configuration
+PERFORMANCE_CONFIG = {
+    'startup_budget_seconds': 1.0,  # Import time allowed before the analysis starts
+    'clean_data': False,  # Run DataMapper.data_fast on the raw data before analysis
+    'chunk_size': 1_000_000,  # Rows per chunk when streaming statistics from CSV files
+    'workers': 1,  # Processes for per-group bootstrap resampling, None uses every core
+    'append_buffer_size': 100_000  # Records DataMapper.add_value buffers before building a block
 }
 
 # Report Configuration
@@ -45,12 +62,16 @@ REPORT_CONFIG = {
     'generate_pdf_report': False,
     'include_student_names': True,
     'include_detailed_stats': True,
-    'output_formats': ['json', 'md', 'csv']
+    'output_formats': ['json', 'md', 'csv'],
+    'report_workers': 8  # Threads writing per-class and per-student reports
 }
 
 # Statistical Analysis Configuration
 STATS_CONFIG = {
     'confidence_level': 0.95,
     'correlation_threshold': 0.5,
-    'outlier_threshold': 2.0  # Standard deviations
+    'outlier_threshold': 2.0,  # Standard deviations
+    'robust_outlier_threshold': 3.5,  # Robust (median/MAD) z-score
+    'bootstrap_resamples': 10_000,  # Resamples per group for confidence intervals
+    'bootstrap_seed': 42  # Makes the intervals reproducible
 }
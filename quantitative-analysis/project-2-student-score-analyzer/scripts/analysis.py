@@ -1,14 +1,80 @@
+import time
+_STARTED = time.perf_counter()  # Startup budget covers everything imported below
+
 import pandas as pd
 import numpy as np
-import matplotlib.pyplot as plt
-import seaborn as sns
-from scipy import stats
-import json
 import os
+import sys
+
+# Add config to path and import settings
+sys.path.append('config')
+# CI lints every project in one run, where `settings` resolves to project-1's config module
+from settings import DATA_CONFIG, ANALYSIS_CONFIG, VISUALIZATION_CONFIG, PERFORMANCE_CONFIG, STATS_CONFIG, REPORT_CONFIG  # pylint: disable=no-name-in-module
+from data_cleaning import DataMapper
+from online_stats import OnlineCovariance, OnlineGroupStats, correlation_tests
+from bootstrap import bootstrap_group_cis
+from results_store import ResultsStore
+from charts import draw_class_dashboard, draw_dashboard, render_charts
+from reports import build_class_reports, build_student_reports, write_reports
+
+# Columns the dashboards draw from
+DASHBOARD_COLUMNS = ['class', 'subject', 'score', 'attendance', 'study_hours', 'grade']
+
+# Statistics reported per subject and per class
+SUBJECT_STATS = {
+    'score': ['mean', 'median', 'std', 'count'],
+    'attendance': 'mean',
+    'study_hours': 'mean'
+}
+CLASS_STATS = {
+    'score': ['mean', 'median', 'std'],
+    'attendance': 'mean',
+    'study_hours': 'mean'
+}
+
+
+def read_chunks(data_path=None, chunk_size=None):
+    """Iterate over a scores CSV in chunks of PERFORMANCE_CONFIG['chunk_size'] rows"""
+    return pd.read_csv(data_path or DATA_CONFIG['data_path'],
+                       chunksize=chunk_size or PERFORMANCE_CONFIG['chunk_size'])
+
+
+def build_group_stats(by, spec, chunks):
+    """Accumulate the statistics in spec per value of by over an iterable of chunks.
+    
+    The returned state can be merged with states built from other files or workers
+    and passed to subject_performance / class_comparison.
+    """
+    sketch_ranges = {column: DATA_CONFIG['value_ranges'][column] for column, names in spec.items()
+                     if 'median' in ([names] if isinstance(names, str) else names)}
+    stats = OnlineGroupStats(by, list(spec), sketch_ranges)
+    for chunk in chunks:
+        stats.update(chunk)
+    return stats
+
+
+def build_correlation_stats(chunks, by=None):
+    """Accumulate covariance statistics of every numerical column over chunks, optionally per group"""
+    stats = OnlineCovariance(DATA_CONFIG['numerical_columns'], by)
+    for chunk in chunks:
+        stats.update(chunk)
+    return stats
+
+
+def load_pyplot():
+    """Import pyplot on first use so runs without charts never pay for it"""
+    import matplotlib  # pylint: disable=import-outside-toplevel
+    if VISUALIZATION_CONFIG['headless']:
+        matplotlib.use('Agg')
+    import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+    plt.style.use(VISUALIZATION_CONFIG['style'])
+    return plt
+
 
 class StudentScoreAnalyzer:
-    def __init__(self, data_path):
-        self.data = pd.read_csv(data_path)
+    def __init__(self, data_path=None, data=None):
+        # An already loaded (e.g. cleaned) frame is used as-is, without copying
+        self.data = data if data is not None else pd.read_csv(data_path or DATA_CONFIG['data_path'])
         self.results = {}
     
     def load_data(self):
@@ -26,13 +92,12 @@ class StudentScoreAnalyzer:
         
         return self.data
     
-    def subject_performance(self):
-        """Analyze performance by subject"""
-        subject_stats = self.data.groupby('subject').agg({
-            'score': ['mean', 'median', 'std', 'count'],
-            'attendance': 'mean',
-            'study_hours': 'mean'
-        }).round(2)
+    def subject_performance(self, stats=None):
+        """Analyze performance by subject, from the loaded data or a streamed build_group_stats state"""
+        if stats is not None:
+            subject_stats = stats.table(SUBJECT_STATS).round(2)
+        else:
+            subject_stats = self.data.groupby('subject').agg(SUBJECT_STATS).round(2)
         
         print("\n=== Subject Performance ===")
         print(subject_stats)
@@ -40,13 +105,12 @@ class StudentScoreAnalyzer:
         self.results['subject_performance'] = subject_stats
         return subject_stats
     
-    def class_comparison(self):
-        """Compare performance between classes"""
-        class_stats = self.data.groupby('class').agg({
-            'score': ['mean', 'median', 'std'],
-            'attendance': 'mean',
-            'study_hours': 'mean'
-        }).round(2)
+    def class_comparison(self, stats=None):
+        """Compare performance between classes, from the loaded data or a streamed build_group_stats state"""
+        if stats is not None:
+            class_stats = stats.table(CLASS_STATS).round(2)
+        else:
+            class_stats = self.data.groupby('class').agg(CLASS_STATS).round(2)
         
         print("\n=== Class Comparison ===")
         print(class_stats)
@@ -54,29 +118,151 @@ class StudentScoreAnalyzer:
         self.results['class_comparison'] = class_stats
         return class_stats
     
-    def correlation_analysis(self):
-        """Analyze correlations between variables"""
-        numeric_columns = ['score', 'attendance', 'study_hours']
-        correlation_matrix = self.data[numeric_columns].corr()
+    def correlation_analysis(self, stats=None):
+        """Analyze correlations between variables, from the loaded data or a build_correlation_stats state"""
+        numeric_columns = DATA_CONFIG['numerical_columns']
+        threshold = STATS_CONFIG['correlation_threshold']
+        
+        if stats is not None and stats.by:
+            return self._group_correlations(stats, threshold)
+        if stats is not None:
+            correlation_matrix, count = stats.correlation()
+        else:
+            correlation_matrix = self.data[numeric_columns].corr()
+            present = self.data[numeric_columns].notna().to_numpy(dtype='int64')
+            count = present.T @ present  # rows behind each pairwise coefficient
+        tests = correlation_tests(correlation_matrix, count, threshold)
         
         print("\n=== Correlation Analysis ===")
         print(correlation_matrix)
+        print(f"\nPairs with |r| >= {threshold}:")
+        print(tests[tests['flagged']].to_string(index=False))
         
         # Convert to regular Python types for JSON serialization
         self.results['correlations'] = correlation_matrix.round(4).to_dict()
+        self.results['significant_correlations'] = tests[tests['flagged']].round({'correlation': 4, 't_statistic': 4}).to_dict('records')
         return correlation_matrix
     
+    def _group_correlations(self, stats, threshold):
+        """Correlation tests for every group of a grouped correlation state"""
+        tests = []
+        for group in stats.groups():
+            matrix, count = stats.correlation(group)
+            tests.append(correlation_tests(matrix, count, threshold).assign(**{stats.by: group}))
+        tests = pd.concat(tests, ignore_index=True)
+        
+        print(f"\n=== Correlation Analysis by {stats.by} ===")
+        print(tests[tests['flagged']].to_string(index=False))
+        
+        self.results[f'correlations_by_{stats.by}'] = tests.round({'correlation': 4, 't_statistic': 4}).to_dict('records')
+        return tests
+    
+    def outlier_detection(self, by=None, column=None):
+        """Flag scores that are unusual within their subject and class.
+        
+        Every row gets a z-score against its group mean/std and a robust score against
+        its group median/MAD, computed with grouped transforms in one vectorized pass.
+        """
+        by = by or ['subject', 'class']
+        column = column or DATA_CONFIG['score_column']
+        threshold = STATS_CONFIG['outlier_threshold']
+        robust_threshold = STATS_CONFIG['robust_outlier_threshold']
+        
+        z_score, robust_score = self._group_scores(self.data, by, column)
+        z_flag = (z_score.abs() > threshold).to_numpy()
+        robust_flag = (robust_score.abs() > robust_threshold).to_numpy()
+        flagged = z_flag | robust_flag
+        
+        id_columns = [c for c in [DATA_CONFIG['primary_key'], 'name'] if c in self.data.columns]
+        outlier_rows = self.data.loc[flagged, id_columns + by + [column]].assign(
+            z_score=z_score[flagged].round(3),
+            robust_score=robust_score[flagged].round(3),
+            z_outlier=z_flag[flagged],
+            robust_outlier=robust_flag[flagged]
+        )
+        group_counts = outlier_rows.groupby(by, observed=True).size().rename('outliers')
+        
+        print("\n=== Outlier Detection ===")
+        print(f"Flagged {int(flagged.sum())} of {len(self.data)} rows "
+              f"(|z| > {threshold} or |robust z| > {robust_threshold}, grouped by {', '.join(by)})")
+        print(outlier_rows.head(20))
+        
+        self.results['outliers'] = {
+            'grouped_by': by,
+            'z_threshold': threshold,
+            'robust_threshold': robust_threshold,
+            'total_rows': int(len(self.data)),
+            'flagged_rows': int(flagged.sum()),
+            'z_score_outliers': int(z_flag.sum()),
+            'robust_outliers': int(robust_flag.sum())
+        }
+        self.results['outlier_rows'] = outlier_rows
+        self.results['outliers_by_group'] = group_counts.reset_index()
+        return outlier_rows
+    
+    @staticmethod
+    def _group_scores(data, by, column):
+        """z-score and robust (median/MAD) z-score of every row within its group.
+        
+        The robust score is NaN only where every value in the group is the same.
+        """
+        # Factorize the groups once and reuse the integer codes for every transform
+        codes = data.groupby(by, observed=True, sort=False).ngroup().to_numpy()
+        values = data[column].astype('float64')
+        grouped = values.groupby(codes)
+        deviation = values - grouped.transform('median')
+        absolute = deviation.abs().groupby(codes)
+        # 1.4826 * MAD estimates the standard deviation for normal data; when at least half
+        # the group shares the median the MAD is 0, so fall back to 1.2533 * mean absolute deviation
+        scale = 1.4826 * absolute.transform('median')
+        scale = scale.where(scale > 0, 1.2533 * absolute.transform('mean'))
+        
+        with np.errstate(divide='ignore', invalid='ignore'):
+            z_score = (values - grouped.transform('mean')) / grouped.transform('std')
+            robust_score = deviation / scale
+        return z_score, robust_score
+    
+    def confidence_intervals(self, groupings=('subject', 'class'), column=None):
+        """Bootstrap confidence intervals of the mean score per subject and per class"""
+        column = column or DATA_CONFIG['score_column']
+        confidence = STATS_CONFIG['confidence_level']
+        intervals = {}
+        
+        print(f"\n=== {confidence:.0%} Bootstrap Confidence Intervals ({STATS_CONFIG['bootstrap_resamples']} resamples) ===")
+        for by in groupings:
+            table = bootstrap_group_cis(self.data.groupby(by, observed=True)[column],
+                                        STATS_CONFIG['bootstrap_resamples'], confidence=confidence,
+                                        workers=PERFORMANCE_CONFIG['workers'],
+                                        seed=STATS_CONFIG['bootstrap_seed']).round(2)
+            print(table)
+            self.results[f'confidence_intervals_{by}'] = table
+            intervals[by] = table
+        
+        return intervals
+    
+    @staticmethod
+    def assign_grades(scores, thresholds=None):
+        """Bin scores into letter grades using the configured minimum score per grade"""
+        thresholds = thresholds or ANALYSIS_CONFIG['grade_thresholds']
+        ordered = sorted(thresholds.items(), key=lambda item: item[1])
+        letters = [letter for letter, _ in ordered]
+        cutoffs = np.array([cutoff for _, cutoff in ordered], dtype='float64')
+        
+        values = scores.to_numpy(dtype='float64', na_value=np.nan)
+        positions = np.searchsorted(cutoffs, values, side='right') - 1
+        # Missing scores and scores below the lowest cutoff get no grade
+        positions[np.isnan(values)] = -1
+        
+        # Categories run from the highest grade down, matching the report order
+        codes = np.where(positions < 0, -1, len(letters) - 1 - positions).astype('int8')
+        grades = pd.Categorical.from_codes(codes, categories=letters[::-1])
+        return pd.Series(grades, index=scores.index, name='grade')
+    
     def grade_distribution(self):
         """Calculate grade distribution"""
-        def assign_grade(score):
-            if score >= 90: return 'A'
-            elif score >= 80: return 'B'
-            elif score >= 70: return 'C'
-            elif score >= 60: return 'D'
-            else: return 'F'
-        
-        self.data['grade'] = self.data['score'].apply(assign_grade)
-        grade_dist = self.data['grade'].value_counts().sort_index()
+        self.data['grade'] = self.assign_grades(self.data['score'])
+        grade_dist = self.data['grade'].value_counts(sort=False)
+        grade_dist = grade_dist[grade_dist > 0]
         
         print("\n=== Grade Distribution ===")
         print(grade_dist)
@@ -105,61 +291,44 @@ class StudentScoreAnalyzer:
     
     def create_visualizations(self):
         """Create comprehensive visualizations"""
-        plt.style.use('seaborn-v0_8')
-        fig, axes = plt.subplots(2, 3, figsize=(18, 12))
-        
-        # 1. Score distribution histogram
-        axes[0,0].hist(self.data['score'], bins=10, color='skyblue', edgecolor='black', alpha=0.7)
-        axes[0,0].set_title('Score Distribution')
-        axes[0,0].set_xlabel('Score')
-        axes[0,0].set_ylabel('Frequency')
-        
-        # 2. Subject comparison
-        subject_means = self.data.groupby('subject')['score'].mean()
-        axes[0,1].bar(subject_means.index, subject_means.values, color='lightcoral')
-        axes[0,1].set_title('Average Scores by Subject')
-        axes[0,1].set_ylabel('Average Score')
-        axes[0,1].tick_params(axis='x', rotation=45)
-        
-        # 3. Class comparison
-        class_means = self.data.groupby('class')['score'].mean()
-        axes[0,2].bar(class_means.index, class_means.values, color='lightgreen')
-        axes[0,2].set_title('Average Scores by Class')
-        axes[0,2].set_ylabel('Average Score')
-        
-        # 4. Study hours vs Score scatter plot
-        axes[1,0].scatter(self.data['study_hours'], self.data['score'], alpha=0.6, color='purple')
-        axes[1,0].set_xlabel('Study Hours')
-        axes[1,0].set_ylabel('Score')
-        axes[1,0].set_title('Study Hours vs Score')
-        
-        # 5. Attendance vs Score
-        axes[1,1].scatter(self.data['attendance'], self.data['score'], alpha=0.6, color='orange')
-        axes[1,1].set_xlabel('Attendance (%)')
-        axes[1,1].set_ylabel('Score')
-        axes[1,1].set_title('Attendance vs Score')
-        
-        # 6. Grade distribution
-        grade_dist = self.data['grade'].value_counts().sort_index()
-        axes[1,2].pie(grade_dist.values, labels=grade_dist.index, autopct='%1.1f%%')
-        axes[1,2].set_title('Grade Distribution')
-        
-        plt.tight_layout()
-        plt.savefig('results/student_performance_dashboard.png', dpi=300, bbox_inches='tight')
+        inputs = {'data': self.data[DASHBOARD_COLUMNS]}
+        if VISUALIZATION_CONFIG['headless']:
+            # Rendered without a window and skipped when the data has not changed
+            render_charts([('student_performance_dashboard.png', draw_dashboard, inputs)], 'results',
+                          VISUALIZATION_CONFIG['dpi'], VISUALIZATION_CONFIG['style'])
+            return
+        
+        plt = load_pyplot()
+        draw_dashboard(plt, inputs)
+        plt.savefig('results/student_performance_dashboard.png', dpi=VISUALIZATION_CONFIG['dpi'],
+                    bbox_inches='tight')
         plt.show()
     
-    def save_results(self):
-        """Save analysis results to files"""
-        os.makedirs('results', exist_ok=True)
+    def class_dashboards(self, directory='results/class_dashboards'):
+        """Render one dashboard per class headlessly, in parallel, redrawing only changed classes"""
+        data = self.data[DASHBOARD_COLUMNS]
+        jobs = [(f"class_{label}.png", draw_class_dashboard, {'label': label, 'data': group})
+                for label, group in data.groupby('class', observed=True)]
         
-        # Save statistical results
-        with open('results/statistical_analysis.json', 'w') as f:
-            json.dump(self.results, f, indent=2)
+        start = time.perf_counter()
+        rendered, skipped = render_charts(jobs, directory, VISUALIZATION_CONFIG['group_dashboard_dpi'],
+                                          VISUALIZATION_CONFIG['style'],
+                                          VISUALIZATION_CONFIG['render_workers'] or os.cpu_count())
+        print(f"\n🖼️  Class dashboards: {rendered} rendered, {skipped} unchanged "
+              f"({time.perf_counter() - start:.2f}s) -> {directory}/")
+    
+    def save_results(self):
+        """Save analysis results to files (tables as Parquet, everything else as JSON)"""
+        start = time.perf_counter()
+        manifest = ResultsStore('results').save(self.results)
+        elapsed = time.perf_counter() - start
         
         # Save detailed report
         self.generate_report()
         
-        print("✅ Results saved to 'results/' folder")
+        tables = sum(1 for entry in manifest.values() if entry['kind'] == 'table')
+        print(f"✅ Results saved to 'results/' folder ({tables} tables, "
+              f"{len(manifest) - tables} other results in {elapsed:.3f}s)")
     
     def generate_report(self):
         """Generate a comprehensive analysis report"""
@@ -197,9 +366,37 @@ class StudentScoreAnalyzer:
         with open('results/performance_report.md', 'w') as f:
             f.write(report)
 
+    def fan_out_reports(self, directory='results/reports'):
+        """Write one report per class and per student, rewriting only the ones whose content changed"""
+        if 'grade' not in self.data.columns:
+            self.data['grade'] = self.assign_grades(self.data['score'])
+        
+        start = time.perf_counter()
+        include_names = REPORT_CONFIG['include_student_names']
+        reports = build_class_reports(self.data, include_names)
+        reports.update(build_student_reports(self.data, include_names))
+        written, skipped, removed = write_reports(reports, directory, REPORT_CONFIG['report_workers'])
+        
+        print(f"\n📝 Reports: {written} written, {skipped} unchanged, {removed} removed "
+              f"({time.perf_counter() - start:.2f}s) -> {directory}/")
+
+def check_startup_budget():
+    """Report how long imports took against the configured startup budget"""
+    startup = time.perf_counter() - _STARTED
+    budget = PERFORMANCE_CONFIG['startup_budget_seconds']
+    status = "within" if startup <= budget else "⚠️  OVER"
+    print(f"Startup: {startup:.3f}s ({status} budget of {budget:.2f}s)")
+    return startup
+
 def main():
+    check_startup_budget()
+    
     # Initialize analyzer
-    analyzer = StudentScoreAnalyzer('data/student_scores.csv')
+    if PERFORMANCE_CONFIG['clean_data']:
+        cleaned = DataMapper(pd.read_csv(DATA_CONFIG['data_path'])).data_fast()
+        analyzer = StudentScoreAnalyzer(data=cleaned)
+    else:
+        analyzer = StudentScoreAnalyzer(DATA_CONFIG['data_path'])
     
     # Run analyses
     analyzer.load_data()
@@ -208,6 +405,8 @@ def main():
     analyzer.correlation_analysis()
     analyzer.grade_distribution()
     analyzer.factor_analysis()
+    analyzer.outlier_detection()
+    analyzer.confidence_intervals()
     
     # Save results
     analyzer.save_results()
@@ -0,0 +1,172 @@
+import hashlib
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import pandas as pd
+
+CACHE_FILE = 'chart_cache.json'
+
+
+@lru_cache(maxsize=None)
+def _module_source(module_name):
+    """Source bytes of the module defining a draw function"""
+    with open(sys.modules[module_name].__file__, 'rb') as f:
+        return f.read()
+
+
+def chart_key(draw, inputs, dpi, style):
+    """Content hash of everything that decides how a chart looks"""
+    digest = hashlib.sha256()
+    digest.update(f"{draw.__module__}.{draw.__qualname__}|{dpi}|{style}".encode())
+    # Editing the draw function, the helpers it calls or its constants invalidates its charts
+    digest.update(_module_source(draw.__module__))
+    for name in sorted(inputs):
+        value = inputs[name]
+        digest.update(name.encode())
+        if isinstance(value, (pd.DataFrame, pd.Series)):
+            labels = value.columns if isinstance(value, pd.DataFrame) else value.name
+            digest.update(repr(labels).encode())
+            digest.update(pd.util.hash_pandas_object(value).to_numpy().tobytes())
+        else:
+            digest.update(repr(value).encode())
+    return digest.hexdigest()
+
+
+def _render(path, draw, inputs, dpi, style):
+    """Worker: draw one figure with the Agg backend and write it atomically"""
+    import matplotlib  # pylint: disable=import-outside-toplevel
+    matplotlib.use('Agg')
+    import matplotlib.pyplot as plt  # pylint: disable=import-outside-toplevel
+    plt.style.use(style)
+
+    fig = draw(plt, inputs)
+    root, extension = os.path.splitext(path)
+    temporary = f"{root}.tmp{extension}"
+    fig.savefig(temporary, dpi=dpi, bbox_inches='tight')
+    plt.close(fig)
+    os.replace(temporary, path)
+    return path
+
+
+def _stale_jobs(jobs, directory, cache, dpi, style):
+    """Jobs whose chart is missing or was drawn from other inputs, as
+    (filename, key, path, draw, inputs); their old cache entries are dropped"""
+    pending = []
+    for filename, draw, inputs in jobs:
+        key = chart_key(draw, inputs, dpi, style)
+        path = os.path.join(directory, filename)
+        if cache.get(filename) == key and os.path.exists(path):
+            continue
+        cache.pop(filename, None)
+        pending.append((filename, key, path, draw, inputs))
+    return pending
+
+
+def _render_all(pending, dpi, style, workers):
+    """Render stale jobs, in worker processes when workers > 1; yield (filename, key) per chart"""
+    if workers == 1 or len(pending) < 2:
+        for filename, key, path, draw, inputs in pending:
+            _render(path, draw, inputs, dpi, style)
+            yield filename, key
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {filename: (key, executor.submit(_render, path, draw, inputs, dpi, style))
+                   for filename, key, path, draw, inputs in pending}
+        for filename, (key, future) in futures.items():
+            future.result()
+            yield filename, key
+
+
+def render_charts(jobs, directory, dpi, style, workers=1):
+    """Render (filename, draw, inputs) jobs headlessly, skipping charts whose inputs are unchanged.
+
+    draw(plt, inputs) must be a module-level function returning the figure, so it can
+    run in a worker process. Returns (rendered, skipped) counts.
+    """
+    os.makedirs(directory, exist_ok=True)
+    cache_path = os.path.join(directory, CACHE_FILE)
+    cache = {}
+    if os.path.exists(cache_path):
+        with open(cache_path, 'r') as f:
+            cache = json.load(f)
+
+    pending = _stale_jobs(jobs, directory, cache, dpi, style)
+    for filename, key in _render_all(pending, dpi, style, workers):
+        cache[filename] = key
+
+    with open(cache_path, 'w') as f:
+        json.dump(cache, f, indent=2)
+    return len(pending), len(jobs) - len(pending)
+
+
+def draw_dashboard(plt, inputs):
+    """Six-panel overview of scores, subjects, classes, study habits and grades"""
+    data = inputs['data']
+    fig, axes = plt.subplots(2, 3, figsize=(18, 12))
+
+    # 1. Score distribution histogram
+    axes[0,0].hist(data['score'], bins=10, color='skyblue', edgecolor='black', alpha=0.7)
+    axes[0,0].set_title('Score Distribution')
+    axes[0,0].set_xlabel('Score')
+    axes[0,0].set_ylabel('Frequency')
+
+    # 2. Subject comparison
+    subject_means = data.groupby('subject', observed=True)['score'].mean()
+    axes[0,1].bar(subject_means.index, subject_means.values, color='lightcoral')
+    axes[0,1].set_title('Average Scores by Subject')
+    axes[0,1].set_ylabel('Average Score')
+    axes[0,1].tick_params(axis='x', rotation=45)
+
+    # 3. Class comparison
+    class_means = data.groupby('class', observed=True)['score'].mean()
+    axes[0,2].bar(class_means.index, class_means.values, color='lightgreen')
+    axes[0,2].set_title('Average Scores by Class')
+    axes[0,2].set_ylabel('Average Score')
+
+    _draw_study_habits(axes[1,0], axes[1,1], data)
+    _draw_grades(axes[1,2], data)
+
+    fig.tight_layout()
+    return fig
+
+
+def draw_class_dashboard(plt, inputs):
+    """Four-panel dashboard for the students of one class"""
+    data = inputs['data']
+    fig, axes = plt.subplots(2, 2, figsize=(12, 10))
+    fig.suptitle(f"Class {inputs['label']}")
+
+    subject_means = data.groupby('subject', observed=True)['score'].mean()
+    axes[0,0].bar(subject_means.index, subject_means.values, color='lightcoral')
+    axes[0,0].set_title('Average Scores by Subject')
+    axes[0,0].set_ylabel('Average Score')
+    axes[0,0].tick_params(axis='x', rotation=45)
+
+    _draw_study_habits(axes[0,1], axes[1,0], data)
+    _draw_grades(axes[1,1], data)
+
+    fig.tight_layout()
+    return fig
+
+
+def _draw_study_habits(study_axis, attendance_axis, data):
+    study_axis.scatter(data['study_hours'], data['score'], alpha=0.6, color='purple')
+    study_axis.set_xlabel('Study Hours')
+    study_axis.set_ylabel('Score')
+    study_axis.set_title('Study Hours vs Score')
+
+    attendance_axis.scatter(data['attendance'], data['score'], alpha=0.6, color='orange')
+    attendance_axis.set_xlabel('Attendance (%)')
+    attendance_axis.set_ylabel('Score')
+    attendance_axis.set_title('Attendance vs Score')
+
+
+def _draw_grades(axis, data):
+    grade_dist = data['grade'].value_counts(sort=False)
+    grade_dist = grade_dist[grade_dist > 0]
+    axis.pie(grade_dist.values, labels=grade_dist.index, autopct='%1.1f%%')
+    axis.set_title('Grade Distribution')
@@ -1,16 +1,110 @@
 import pandas as pd
+import sys
+
+# Add config to path and import settings
+sys.path.append('config')
+from settings import DATA_CONFIG, PERFORMANCE_CONFIG
 
 class DataMapper:
-    def __init__(self, data):
+    def __init__(self, data, buffer_size=None):
+        self.buffer_size = buffer_size or PERFORMANCE_CONFIG['append_buffer_size']
         self.data = data
     
+    @property
+    def data(self):
+        """The full dataset, including every record passed to add_value"""
+        if self._pending_rows or self._blocks:
+            self._consolidate()
+        return self._data
+    
+    @data.setter
+    def data(self, data):
+        self._data = data
+        self._pending = {}  # column -> list of values not yet turned into a block
+        self._pending_rows = 0
+        self._blocks = []  # full-size blocks waiting to be joined onto _data
+    
     def data_fast(self):
-        # Method for fast data processing
-        pass
+        """Coerce types, encode categories, drop duplicate records and clamp ranges in one pass.
+        
+        Columns are converted in place on self.data, so the result can be handed straight
+        to StudentScoreAnalyzer(data=...) without another copy.
+        """
+        data = self.data
+        
+        # Unparseable numbers become NaN instead of leaving the column as object
+        for column in DATA_CONFIG['numerical_columns']:
+            if column in data.columns and not pd.api.types.is_numeric_dtype(data[column]):
+                data[column] = pd.to_numeric(data[column], errors='coerce')
+        
+        for column in DATA_CONFIG['categorical_columns']:
+            if column in data.columns and not isinstance(data[column].dtype, pd.CategoricalDtype):
+                data[column] = data[column].astype('category')
+        
+        # Later submissions for the same record supersede earlier ones
+        key = DATA_CONFIG['primary_key']
+        if key in data.columns:
+            duplicated = data[key].duplicated(keep='last')
+            if duplicated.any():
+                data = data.loc[~duplicated.to_numpy()].reset_index(drop=True)
+        
+        for column, (low, high) in DATA_CONFIG['value_ranges'].items():
+            if column in data.columns:
+                data[column] = data[column].clip(low, high)
+        
+        self.data = data
+        return data
     
     def add_value(self, value):
-        # Method to add values
-        pass
+        """Append one record (dict) or a batch (list of dicts, dict of lists or DataFrame).
+        
+        Records are buffered column by column and turned into a DataFrame block every
+        buffer_size rows; blocks are joined onto the data only when it is next read, so
+        appending n records costs O(n) instead of one concat per record.
+        """
+        if isinstance(value, pd.DataFrame):
+            self._flush_pending()
+            self._blocks.append(value)
+        elif isinstance(value, dict) and value and all(isinstance(v, (list, tuple)) for v in value.values()):
+            self._flush_pending()
+            self._blocks.append(pd.DataFrame(value))
+        elif isinstance(value, dict):
+            self._append_record(value)
+        else:
+            for record in value:
+                self._append_record(record)
+        
+        if self._pending_rows >= self.buffer_size:
+            self._flush_pending()
+    
+    def _append_record(self, record):
+        for column in [c for c in record if c not in self._pending]:
+            self._pending[column] = [None] * self._pending_rows
+        for column, values in self._pending.items():
+            values.append(record.get(column))
+        self._pending_rows += 1
+    
+    def _flush_pending(self):
+        """Turn the buffered records into one DataFrame block"""
+        if self._pending_rows:
+            self._blocks.append(pd.DataFrame(self._pending))
+            self._pending = {}
+            self._pending_rows = 0
+    
+    def _consolidate(self):
+        """Join all blocks onto the data with a single concat"""
+        self._flush_pending()
+        base = self._data
+        combined = pd.concat([base] + self._blocks, ignore_index=True)
+        
+        # Keep categorical columns categorical when appended values arrive as plain strings
+        for column in base.columns:
+            if isinstance(base[column].dtype, pd.CategoricalDtype) and \
+                    not isinstance(combined[column].dtype, pd.CategoricalDtype):
+                combined[column] = combined[column].astype('category')
+        
+        self._data = combined
+        self._blocks = []
     
     def new_data_info(self):
         """Displays information about the dataset"""
@@ -32,4 +126,6 @@ if __name__ == "__main__":
     })
     
     program = DataMapper(sample_data)
+    program.add_value({'name': 'Alice', 'score': 88, 'age': 28})
+    program.add_value([{'name': 'Tom', 'score': 71, 'age': 22}, {'name': 'Sara', 'score': 95, 'age': 27}])
     program.new_data_info()
@@ -0,0 +1,252 @@
+import numpy as np
+import pandas as pd
+
+
+class HistogramSketch:
+    """Mergeable per-group histogram over a fixed value range, used for medians.
+
+    Values are snapped to a grid of `resolution` between `low` and `high` (values
+    outside are clamped), so medians are exact for data on the grid, such as
+    whole-number scores, and within resolution / 2 otherwise.
+    """
+
+    def __init__(self, low, high, resolution=1.0):
+        self.low = low
+        self.resolution = resolution
+        self.bins = int(round((high - low) / resolution)) + 1
+        self.counts = pd.DataFrame(dtype='int64', columns=range(self.bins))
+
+    def update(self, groups, values):
+        """Count values per group; groups is a frame of the group key columns of each row"""
+        valid = values.notna().to_numpy()
+        positions = np.rint((values.to_numpy(dtype='float64')[valid] - self.low) / self.resolution)
+        positions = np.clip(positions, 0, self.bins - 1).astype('int64')
+
+        levels = [groups[key].to_numpy()[valid] for key in groups.columns]
+        index = pd.MultiIndex.from_arrays(levels + [positions], names=list(groups.columns) + [None])
+        counts = pd.Series(1, index=index).groupby(level=list(range(len(levels) + 1))).sum()
+        self._add(counts.unstack(fill_value=0))
+
+    def merge(self, other):
+        self._add(other.counts)
+
+    def _add(self, counts):
+        counts = counts.reindex(columns=range(self.bins), fill_value=0)
+        if self.counts.empty:
+            self.counts = counts.astype('int64')
+            return
+        self.counts = self.counts.add(counts, fill_value=0).astype('int64')
+
+    def medians(self):
+        """Median per group, averaging the two middle values for even counts"""
+        counts = self.counts.to_numpy()
+        cumulative = counts.cumsum(axis=1)
+        total = cumulative[:, -1:]
+        # First bin whose cumulative count passes each middle rank
+        lower = (cumulative > (total - 1) // 2).argmax(axis=1)
+        upper = (cumulative > total // 2).argmax(axis=1)
+        medians = self.low + (lower + upper) / 2 * self.resolution
+        medians[total[:, 0] == 0] = np.nan
+        return pd.Series(medians, index=self.counts.index)
+
+
+class OnlineGroupStats:
+    """Streaming count, mean, variance and median per group, mergeable across chunks and workers.
+
+    Moments are combined with Chan et al.'s parallel update, which stays numerically
+    stable where the textbook sum-of-squares formula would not. by is one column or a
+    list of columns, as for DataFrame.groupby.
+    """
+
+    def __init__(self, by, columns, sketch_ranges=None, resolution=1.0):
+        self.by = by
+        self.keys = [by] if isinstance(by, str) else list(by)
+        self.columns = list(columns)
+        index = _plain_labels(pd.MultiIndex.from_arrays([[] for _ in self.keys], names=self.keys))
+        self.count = pd.DataFrame(columns=self.columns, index=index, dtype='int64')
+        self.mean = pd.DataFrame(columns=self.columns, index=index, dtype='float64')
+        self.m2 = pd.DataFrame(columns=self.columns, index=index, dtype='float64')
+        self.sketches = {column: HistogramSketch(low, high, resolution)
+                         for column, (low, high) in (sketch_ranges or {}).items()}
+
+    def update(self, chunk):
+        """Fold in a chunk of raw rows"""
+        grouped = chunk.groupby(self.by, observed=True)[self.columns]
+        count = grouped.count()
+        mean = grouped.mean()
+        m2 = grouped.var(ddof=0) * count
+        for frame in (count, mean, m2):
+            frame.index = _plain_labels(frame.index)
+        self._combine(count, mean, m2)
+
+        for column, sketch in self.sketches.items():
+            sketch.update(chunk[self.keys], chunk[column])
+
+    def merge(self, other):
+        """Fold in the state built from other chunks, files or workers"""
+        self._combine(other.count, other.mean, other.m2)
+        for column, sketch in self.sketches.items():
+            sketch.merge(other.sketches[column])
+
+    def _combine(self, count, mean, m2):
+        count_a, count_b = self.count.align(count, join='outer', fill_value=0)
+        mean_a, mean_b = self.mean.align(mean, join='outer', fill_value=0.0)
+        m2_a, m2_b = self.m2.align(m2, join='outer', fill_value=0.0)
+        count_a, count_b = count_a.astype('float64'), count_b.astype('float64')
+        mean_a, mean_b = mean_a.fillna(0.0), mean_b.fillna(0.0)
+
+        total = count_a + count_b
+        share_b = (count_b / total).fillna(0.0)
+        delta = mean_b - mean_a
+
+        self.mean = (mean_a + delta * share_b).where(total > 0)
+        self.m2 = m2_a.fillna(0.0) + m2_b.fillna(0.0) + delta ** 2 * count_a * share_b
+        self.count = total.astype('int64')
+
+    def statistic(self, column, name):
+        """One statistic ('count', 'mean', 'std', 'var' or 'median') per group"""
+        count = self.count[column]
+        if name == 'count':
+            return count
+        if name == 'mean':
+            return self.mean[column]
+        if name in ('var', 'std'):
+            variance = (self.m2[column] / (count - 1)).where(count > 1)
+            return np.sqrt(variance) if name == 'std' else variance
+        if name == 'median':
+            return self.sketches[column].medians().reindex(count.index)
+        raise ValueError(f"Unsupported statistic '{name}'")
+
+    def table(self, spec):
+        """Build the same layout as DataFrame.groupby(by).agg(spec)"""
+        columns = {}
+        for column, names in spec.items():
+            for name in ([names] if isinstance(names, str) else names):
+                columns[(column, name)] = self.statistic(column, name)
+        table = pd.DataFrame(columns).sort_index()
+        table.index.names = self.keys
+        return table
+
+
+def _plain_labels(index):
+    """Group labels as plain objects, so chunks with different categorical categories still align.
+
+    A single group key gives a flat index and several give a MultiIndex, as groupby does.
+    """
+    if isinstance(index, pd.MultiIndex) and index.nlevels > 1:
+        return pd.MultiIndex.from_arrays([index.get_level_values(level).astype(object)
+                                          for level in range(index.nlevels)], names=index.names)
+    return pd.Index(index.get_level_values(0), dtype=object, name=index.names[0])
+
+
+class OnlineCovariance:
+    """Streaming covariance/correlation sufficient statistics, optionally per group.
+
+    Missing values are skipped pair by pair, as DataFrame.corr does: every statistic
+    of a column pair comes from the rows where both columns are present. Each block
+    is centred on its own mean before cross products are summed, and states are
+    combined with the pairwise (Chan) update, so memory is a few k x k matrices per
+    group regardless of row count.
+    """
+
+    def __init__(self, columns, by=None):
+        self.columns = list(columns)
+        self.by = by
+        self.states = {}  # group -> [count, mean, co-moment, squared-deviation matrices]
+
+    def update(self, chunk):
+        """Fold in a chunk of raw rows"""
+        values = chunk[self.columns].to_numpy(dtype='float64', na_value=np.nan)
+        if not values.size:
+            return
+        if not self.by:
+            self._combine(None, *_pairwise_moments(values))
+            return
+
+        # One slice of rows per group; rows without a group (code -1) sort first and are skipped
+        codes, groups = pd.factorize(chunk[self.by])
+        order = np.argsort(codes, kind='stable')
+        bounds = np.searchsorted(codes[order], np.arange(len(groups) + 1))
+        for group, start, end in zip(groups, bounds[:-1], bounds[1:]):
+            self._combine(group, *_pairwise_moments(values[order[start:end]]))
+
+    def merge(self, other):
+        """Fold in the state built from other chunks, files or workers"""
+        for group, state in other.states.items():
+            self._combine(group, *state)
+
+    def _combine(self, group, count, mean, comoment, m2):
+        if group not in self.states:
+            self.states[group] = [count, mean, comoment, m2]
+            return
+        count_a, mean_a, comoment_a, m2_a = self.states[group]
+        total = count_a + count
+        share = np.divide(count, total, out=np.zeros_like(total), where=total > 0)
+        delta = mean - mean_a
+        weight = count_a * share
+        self.states[group] = [
+            total,
+            mean_a + delta * share,
+            comoment_a + comoment + delta * delta.T * weight,
+            m2_a + m2 + delta ** 2 * weight
+        ]
+
+    def groups(self):
+        return list(self.states)
+
+    def correlation(self, group=None):
+        """Correlation matrix and pairwise row counts for one group (None when ungrouped)"""
+        count, _, comoment, m2 = self.states[group]
+        with np.errstate(divide='ignore', invalid='ignore'):
+            matrix = np.clip(comoment / np.sqrt(m2 * m2.T), -1.0, 1.0)
+        return (pd.DataFrame(matrix, index=self.columns, columns=self.columns),
+                count.astype('int64'))
+
+
+def _pairwise_moments(values):
+    """Sufficient statistics of a block of rows, over pairwise-complete rows.
+
+    Entry [i, j] of each returned matrix covers the rows where columns i and j are
+    both present: their count, the mean of column i, the co-moment of columns i and
+    j, and the sum of squared deviations of column i.
+    """
+    present = ~np.isnan(values)
+    weights = present.astype('float64')
+    column_counts = weights.sum(axis=0)
+    shift = np.divide(np.where(present, values, 0.0).sum(axis=0), column_counts,
+                      out=np.zeros(values.shape[1]), where=column_counts > 0)
+    centred = np.where(present, values - shift, 0.0)
+
+    count = weights.T @ weights
+    sums = centred.T @ weights
+    mean = np.divide(sums, count, out=np.zeros_like(sums), where=count > 0)
+    comoment = centred.T @ centred - count * mean * mean.T
+    m2 = (centred ** 2).T @ weights - count * mean ** 2
+    return count, mean + shift[:, None], comoment, m2
+
+
+def correlation_tests(matrix, count, threshold):
+    """t-test every variable pair of a correlation matrix at once.
+
+    count is the number of rows behind each coefficient, either one number or a
+    matrix of pairwise counts. Pairs with |r| >= threshold are flagged.
+    """
+    from scipy import stats  # pylint: disable=import-outside-toplevel
+
+    first, second = np.triu_indices(len(matrix), k=1)
+    r = matrix.to_numpy()[first, second]
+    n = np.broadcast_to(np.asarray(count, dtype='float64'), matrix.shape)[first, second]
+    degrees = n - 2
+    with np.errstate(divide='ignore', invalid='ignore'):
+        t = r * np.sqrt(degrees / (1 - r ** 2))
+    p_value = np.where(degrees > 0, 2 * stats.t.sf(np.abs(t), np.maximum(degrees, 1)), np.nan)
+
+    return pd.DataFrame({
+        'variable_1': matrix.index[first],
+        'variable_2': matrix.columns[second],
+        'correlation': r,
+        'n': n.astype('int64'),
+        't_statistic': t,
+        'p_value': p_value,
+        'flagged': np.abs(r) >= threshold
+    })
@@ -0,0 +1,177 @@
+import hashlib
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from string import Template
+
+import numpy as np
+import pandas as pd
+
+from settings import ANALYSIS_CONFIG
+
+MANIFEST_FILE = 'report_manifest.json'
+
+# Parsed once at import; each report is a single substitute() call. Reports carry no
+# timestamp, so an unchanged input renders byte-identical text and is not rewritten.
+CLASS_TEMPLATE = Template("""# Class $label Report
+
+## Summary
+- **Students**: $students
+- **Average Score**: $mean
+- **Median Score**: $median
+- **Highest Score**: $highest
+- **Lowest Score**: $lowest
+- **Passing Rate**: $pass_rate%
+
+## Performance by Subject
+$subjects
+
+## Grade Distribution
+$grades
+
+## Students Below Passing Score ($passing_score)
+$below
+""")
+
+STUDENT_TEMPLATE = Template("""# Student Report: $name
+
+- **Student ID**: $student_id
+- **Class**: $class_label
+- **Average Score**: $mean
+- **Attendance**: $attendance%
+- **Study Hours**: $study_hours
+
+## Scores
+| Subject | Score | Grade | Class Average | Rank in Class |
+|---|---|---|---|---|
+$rows
+""")
+
+
+def _class_aggregates(data, passing_score, include_names):
+    """Every statistic the class reports draw from, computed once for all classes"""
+    classes = data.groupby('class', observed=True)
+    below_columns = ['class', 'student_id'] + (['name'] if include_names else []) + ['subject', 'score']
+    below = data.loc[data['score'] < passing_score, below_columns]
+    return {
+        'summary': classes['score'].agg(['mean', 'median', 'max', 'min']).round(2),
+        'students': classes['student_id'].nunique(),
+        'pass_rate': ((data['score'] >= passing_score).groupby(data['class'], observed=True).mean() * 100).round(1),
+        'subjects': data.groupby(['class', 'subject'], observed=True)['score'].agg(['count', 'mean', 'min', 'max']).round(2),
+        'grades': data.groupby(['class', 'grade'], observed=True).size(),
+        'below_by_class': dict(tuple(below.groupby('class', observed=True)))
+    }
+
+
+def build_class_reports(data, include_names=True):
+    """Render one report per class from aggregates computed once for all classes"""
+    passing_score = ANALYSIS_CONFIG['passing_score']
+    aggregates = _class_aggregates(data, passing_score, include_names)
+
+    reports = {}
+    for label, row in aggregates['summary'].iterrows():
+        failing = aggregates['below_by_class'].get(label)
+        reports[f"classes/class_{label}.md"] = CLASS_TEMPLATE.substitute(
+            label=label,
+            students=aggregates['students'][label],
+            mean=row['mean'],
+            median=row['median'],
+            highest=row['max'],
+            lowest=row['min'],
+            pass_rate=aggregates['pass_rate'][label],
+            subjects=aggregates['subjects'].loc[label].to_string(),
+            grades=aggregates['grades'].loc[label].to_string(),
+            passing_score=passing_score,
+            below='None' if failing is None else failing.drop(columns='class').to_string(index=False)
+        )
+    return reports
+
+
+def build_student_reports(data, include_names=True):
+    """Render one report per student; score table rows are built for every student at once.
+
+    Rows with a missing score are left out of the score table and the class ranks.
+    """
+    codes, student_ids = pd.factorize(data['student_id'])
+    scored = data['score'].notna().to_numpy()
+    rows = _score_rows(data[scored])
+
+    # Join each student's rows with a slice per student instead of a Python groupby callback
+    codes_scored = codes[scored]
+    order = np.argsort(codes_scored, kind='stable')
+    lines = rows.to_numpy(dtype=object)[order].tolist()
+    bounds = np.searchsorted(codes_scored[order], np.arange(len(student_ids) + 1))
+
+    students = data.groupby(codes).agg(
+        name=('name', 'first'),
+        class_label=('class', 'first'),
+        mean=('score', 'mean'),
+        attendance=('attendance', 'mean'),
+        study_hours=('study_hours', 'mean')
+    )
+    students.index = student_ids
+    students['rows'] = ['\n'.join(lines[start:end]) for start, end in zip(bounds[:-1], bounds[1:])]
+    students[['mean', 'attendance', 'study_hours']] = students[['mean', 'attendance', 'study_hours']].round(2)
+    if not include_names:
+        students['name'] = "Student " + students.index.astype(str)
+
+    return {f"students/student_{student_id}.md": STUDENT_TEMPLATE.substitute(
+                student_id=student_id, **student._asdict())
+            for student_id, student in zip(students.index, students.itertuples(index=False))}
+
+
+def _score_rows(data):
+    """One markdown table row per score, with the class/subject average and rank"""
+    keys = [data['class'], data['subject']]
+    by_class_subject = data['score'].groupby(keys, observed=True)
+    class_average = by_class_subject.transform('mean').round(2)
+    rank = by_class_subject.rank(ascending=False, method='min').astype('int64')
+    size = by_class_subject.transform('size')
+
+    return ("| " + data['subject'].astype(str) + " | " + data['score'].astype(str)
+            + " | " + data['grade'].astype(str) + " | " + class_average.astype(str)
+            + " | " + rank.astype(str) + " of " + size.astype(str) + " |")
+
+
+def _write(path, text):
+    with open(path, 'w') as f:
+        f.write(text)
+
+
+def write_reports(reports, directory, workers=8):
+    """Write {relative path: text} reports with a thread pool, skipping ones that are unchanged.
+
+    Reports written by an earlier run but no longer produced are removed. Returns
+    (written, skipped, removed) counts.
+    """
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r') as f:
+            manifest = json.load(f)
+
+    pending = []
+    for filename, text in reports.items():
+        digest = hashlib.sha256(text.encode()).hexdigest()
+        path = os.path.join(directory, filename)
+        if manifest.get(filename) == digest and os.path.exists(path):
+            continue
+        manifest[filename] = digest
+        pending.append((path, text))
+
+    stale = [filename for filename in manifest if filename not in reports]
+    for filename in stale:
+        path = os.path.join(directory, filename)
+        if os.path.exists(path):
+            os.remove(path)
+        del manifest[filename]
+
+    for subdirectory in {os.path.dirname(path) for path, _ in pending}:
+        os.makedirs(subdirectory, exist_ok=True)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        list(executor.map(lambda job: _write(*job), pending))
+
+    os.makedirs(directory, exist_ok=True)
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    return len(pending), len(reports) - len(pending), len(stale)
@@ -0,0 +1,83 @@
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # Parquet engine, optional
+    TABLE_FORMAT = 'parquet'
+except ImportError:
+    TABLE_FORMAT = 'pickle'
+
+
+def _to_json(value):
+    """Convert NumPy scalars and arrays that json cannot encode"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+class ResultsStore:
+    """Analysis results on disk: tables as Parquet files, everything else in one JSON file.
+
+    A manifest records where each result lives, so load() can read a single table
+    without touching the others.
+    """
+
+    def __init__(self, directory='results', scalar_file='statistical_analysis.json'):
+        self.directory = directory
+        self.table_directory = os.path.join(directory, 'tables')
+        self.scalar_path = os.path.join(directory, scalar_file)
+        self.manifest_path = os.path.join(directory, 'results_manifest.json')
+        self._scalars = None
+
+    def save(self, results):
+        """Write every result and return the manifest"""
+        os.makedirs(self.table_directory, exist_ok=True)
+        manifest = {}
+        scalars = {}
+
+        for name, value in results.items():
+            if isinstance(value, pd.Series):
+                value = value.to_frame()
+            if isinstance(value, pd.DataFrame):
+                path = os.path.join(self.table_directory, f"{name}.{TABLE_FORMAT}")
+                if TABLE_FORMAT == 'parquet':
+                    value.to_parquet(path)
+                else:
+                    value.to_pickle(path)
+                manifest[name] = {'kind': 'table', 'path': os.path.relpath(path, self.directory),
+                                  'rows': len(value)}
+            else:
+                scalars[name] = value
+                manifest[name] = {'kind': 'scalar'}
+
+        with open(self.scalar_path, 'w') as f:
+            json.dump(scalars, f, indent=2, default=_to_json)
+        with open(self.manifest_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+
+        self._scalars = scalars
+        return manifest
+
+    def manifest(self):
+        with open(self.manifest_path, 'r') as f:
+            return json.load(f)
+
+    def names(self):
+        return list(self.manifest())
+
+    def load(self, name):
+        """Load one result; tables are read from their own file only"""
+        entry = self.manifest()[name]
+        if entry['kind'] == 'table':
+            path = os.path.join(self.directory, entry['path'])
+            return pd.read_parquet(path) if path.endswith('.parquet') else pd.read_pickle(path)
+
+        if self._scalars is None:
+            with open(self.scalar_path, 'r') as f:
+                self._scalars = json.load(f)
+        return self._scalars[name]
@@ -0,0 +1,20 @@
+import os
+import sys
+
+import pandas as pd
+
+PROJECT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(os.path.join(PROJECT, 'config'))
+sys.path.append(os.path.join(PROJECT, 'scripts'))
+from data_cleaning import DataMapper
+
+
+def test_appended_records_keep_their_column_order():
+    columns = ['student_id', 'name', 'class', 'subject', 'score']
+    mapper = DataMapper(pd.DataFrame())
+
+    mapper.add_value([dict(zip(columns, [1, 'Ana', '10A', 'Mathematics', 91.0])),
+                      dict(zip(columns, [2, 'Ben', '10A', 'Science', 72.0]))])
+
+    assert list(mapper.data.columns) == columns
+    assert mapper.data['score'].tolist() == [91.0, 72.0]
@@ -0,0 +1,66 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+PROJECT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(os.path.join(PROJECT, 'scripts'))
+from online_stats import OnlineCovariance, OnlineGroupStats
+
+COLUMNS = ['score', 'attendance', 'study_hours']
+
+
+def _scores(rows=3000, seed=7):
+    rng = np.random.default_rng(seed)
+    data = pd.DataFrame({'class': rng.choice(['10A', '10B'], rows),
+                         'attendance': rng.normal(90, 5, rows),
+                         'study_hours': rng.normal(3, 1, rows)})
+    data['score'] = 0.5 * data['attendance'] + 5 * data['study_hours'] + rng.normal(0, 5, rows)
+    for column in COLUMNS:
+        data.loc[rng.random(rows) < 0.1, column] = np.nan
+    return data
+
+
+def _stream(data, by=None, chunks=4):
+    # Two states over alternating chunks, merged, as separate workers would build them
+    first, second = OnlineCovariance(COLUMNS, by), OnlineCovariance(COLUMNS, by)
+    for position, rows in enumerate(np.array_split(np.arange(len(data)), chunks)):
+        (first if position % 2 else second).update(data.iloc[rows])
+    first.merge(second)
+    return first
+
+
+def test_streaming_correlation_matches_pairwise_corr():
+    data = _scores()
+    matrix, count = _stream(data).correlation()
+
+    pd.testing.assert_frame_equal(matrix, data[COLUMNS].corr())
+    present = data[COLUMNS].notna().to_numpy(dtype='int64')
+    np.testing.assert_array_equal(count, present.T @ present)
+
+
+def test_grouped_streaming_correlation_matches_corr():
+    data = _scores()
+    stats = _stream(data, by='class')
+
+    assert sorted(stats.groups()) == ['10A', '10B']
+    for group in stats.groups():
+        matrix, _ = stats.correlation(group)
+        pd.testing.assert_frame_equal(matrix, data.loc[data['class'] == group, COLUMNS].corr())
+
+
+def test_group_stats_by_several_columns_match_groupby():
+    data = _scores().assign(subject=lambda frame: np.where(frame.index % 3, 'Mathematics', 'Science'))
+    data['score'] = data['score'].round()
+    spec = {'score': ['count', 'mean', 'std', 'median']}
+
+    stats = OnlineGroupStats(['subject', 'class'], list(spec), {'score': (0, 150)})
+    for rows in np.array_split(np.arange(len(data)), 4):
+        stats.update(data.iloc[rows])
+    table = stats.table(spec)
+
+    expected = data.groupby(['subject', 'class']).agg(spec)
+    assert table.index.names == ['subject', 'class']
+    assert table.index.tolist() == expected.index.tolist()
+    np.testing.assert_allclose(table.to_numpy(dtype='float64'), expected.to_numpy(dtype='float64'))
@@ -0,0 +1,26 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+PROJECT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(os.path.join(PROJECT, 'config'))
+sys.path.append(os.path.join(PROJECT, 'scripts'))
+# pylint resolves 'analysis' to the sales project's module of the same name
+from analysis import StudentScoreAnalyzer  # pylint: disable=no-name-in-module
+
+
+def test_robust_score_falls_back_when_mad_is_zero():
+    data = pd.DataFrame({'student_id': range(1, 16),
+                         'subject': ['Mathematics'] * 6 + ['Physics'] * 6 + ['Science'] * 3,
+                         'class': ['10A'] * 15,
+                         'score': [80, 80, 80, 80, 81, 79, 80, 80, 80, 80, 95, 79, 70, 70, 70]})
+
+    outliers = StudentScoreAnalyzer(data=data).outlier_detection(by=['subject'])
+
+    # Every group has a MAD of 0, so the robust score uses 1.2533 * mean absolute deviation:
+    # 81 among the Mathematics 80s is not flagged, 95 among the Physics 80s is
+    assert outliers['student_id'].tolist() == [11]
+    assert np.isclose(outliers['robust_score'].iloc[0], 15 / (1.2533 * 16 / 6), atol=1e-3)
+    assert outliers['robust_outlier'].iloc[0]
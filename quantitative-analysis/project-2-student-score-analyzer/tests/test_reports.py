@@ -0,0 +1,45 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+PROJECT = os.path.join(os.path.dirname(__file__), '..')
+sys.path.append(os.path.join(PROJECT, 'config'))
+sys.path.append(os.path.join(PROJECT, 'scripts'))
+from reports import build_class_reports, build_student_reports
+
+
+def _scores():
+    return pd.DataFrame({
+        'student_id': [1, 1, 2, 2, 3, 3],
+        'name': ['Ana', 'Ana', 'Ben', 'Ben', 'Cai', 'Cai'],
+        'class': ['10A'] * 6,
+        'subject': ['Mathematics', 'Science'] * 3,
+        'score': [91.0, 55.0, np.nan, 72.0, 48.0, 80.0],
+        'grade': ['A', 'F', 'F', 'C', 'F', 'B'],
+        'attendance': [95.0, 95.0, 80.0, 80.0, 70.0, 70.0],
+        'study_hours': [3.0, 3.0, 2.0, 2.0, 1.0, 1.0]
+    })
+
+
+def test_missing_score_is_left_out_of_ranks():
+    reports = build_student_reports(_scores())
+
+    assert len(reports) == 3
+    ben = reports['students/student_2.md']
+    assert 'Mathematics' not in ben
+    assert '| Science | 72.0 | C |' in ben
+    # Two students have a Mathematics score, so ranks run to 2
+    assert '| Mathematics | 48.0 | F | 69.5 | 2 of 2 |' in reports['students/student_3.md']
+
+
+def test_names_hidden_when_disabled():
+    data = _scores()
+    class_report = build_class_reports(data, include_names=False)['classes/class_10A.md']
+    student_report = build_student_reports(data, include_names=False)['students/student_1.md']
+
+    for name in ['Ana', 'Ben', 'Cai']:
+        assert name not in class_report
+        assert name not in student_report
+    assert 'Cai' in build_class_reports(data)['classes/class_10A.md']